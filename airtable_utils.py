@@ -3,14 +3,116 @@ Utility functions for interacting with Airtable API.
 Provides helper methods for reading and writing data across multiple tables.
 """
 
-from typing import Dict, List, Any, Optional
-from pyairtable import Api
+import threading
+import time
+from typing import Dict, List, Any, Optional, Iterator
+from pyairtable import Api, Table
+from pyairtable.formulas import match, FIELD
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RequestException
+from urllib3.util.retry import Retry
 from config import Config
 import logging
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Maximum number of records Airtable accepts in a single batch write request.
+MAX_BATCH_RECORDS = 10
+
+# Fields read from each child table. Requesting only these keeps formula,
+# attachment and other unused columns out of every list response.
+PERSONAL_DETAILS_FIELDS = ['Applicant ID', 'Full Name', 'Email', 'Location', 'LinkedIn']
+WORK_EXPERIENCE_FIELDS = [
+    'Applicant ID', 'Company', 'Title', 'Start Date', 'End Date', 'Technologies', 'Description'
+]
+SALARY_PREFERENCES_FIELDS = [
+    'Applicant ID', 'Preferred Rate', 'Minimum Rate', 'Currency', 'Availability (hrs/wk)'
+]
+
+
+def _linked_applicant_id(record: Dict[str, Any]) -> Optional[str]:
+    """Return the applicant ID a child record is linked to, if any."""
+    linked = record.get('fields', {}).get('Applicant ID')
+    return linked[0] if linked else None
+
+
+def _first_by_applicant(records: List[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Index child records by linked applicant ID, keeping the first record per applicant."""
+    by_applicant = {}
+    for record in records:
+        applicant_id = _linked_applicant_id(record)
+        if applicant_id and applicant_id not in by_applicant:
+            by_applicant[applicant_id] = record
+    return by_applicant
+
+
+def _group_by_applicant(records: List[Dict[str, Any]]) -> Dict[str, List[Dict[str, Any]]]:
+    """Group child records into lists keyed by linked applicant ID."""
+    by_applicant = {}
+    for record in records:
+        applicant_id = _linked_applicant_id(record)
+        if applicant_id:
+            by_applicant.setdefault(applicant_id, []).append(record)
+    return by_applicant
+
+
+class _AirtableRetry(Retry):
+    """
+    Retry policy that never replays a write Airtable may already have applied.
+
+    Airtable rejects a rate-limited (429) request before doing any work, so 429s
+    are retried for every method. A gateway error or read timeout can arrive after
+    a create was committed, so those are retried only for ``allowed_methods``.
+    """
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if status_code == 429 and self.status_forcelist and 429 in self.status_forcelist:
+            return True
+        return super().is_retry(method, status_code, has_retry_after)
+
+
+class _RequestThrottle:
+    """
+    Thread-safe throttle spacing request starts evenly at ``per_second`` requests/second.
+
+    Airtable allows 5 requests per second per base and locks a client out for
+    30 seconds when it goes over, so concurrent workers share one throttle
+    rather than each backing off after a 429. A rate of 0 disables it.
+    """
+
+    def __init__(self, per_second: float):
+        """Start with the first request slot available immediately."""
+        self.interval = 1 / per_second if per_second > 0 else 0
+        self.next_slot = time.monotonic()
+        self._lock = threading.Lock()
+
+    def wait(self) -> None:
+        """Block until this caller's request slot comes up."""
+        if not self.interval:
+            return
+
+        # Reserve the next free slot under the lock, then sleep outside it
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class _ThrottledAdapter(HTTPAdapter):
+    """HTTPAdapter that waits on a shared _RequestThrottle before each request."""
+
+    def __init__(self, throttle: _RequestThrottle, **kwargs: Any):
+        self.throttle = throttle
+        super().__init__(**kwargs)
+
+    def send(self, request, **kwargs):
+        self.throttle.wait()
+        return super().send(request, **kwargs)
+
 
 class AirtableClient:
     """Wrapper for Airtable API operations."""
@@ -18,7 +120,41 @@ class AirtableClient:
     def __init__(self):
         """Initialize Airtable API client."""
         Config.validate()
-        self.api = Api(Config.AIRTABLE_API_KEY)
+
+        # Rate limits (429) and transient gateway errors are retried here, at the
+        # transport level, with exponential backoff (honoring Retry-After). Airtable
+        # locks a client out for 30s after a 429; urllib3 waits 0, 2f, 4f, 8f, 16f
+        # seconds for backoff factor f, so the defaults (f=2, 5 retries) wait 0, 4,
+        # 8, 16 and 32s, 60s in total, with the last retry well past the lockout.
+        # Gateway errors and read timeouts are only retried for idempotent methods,
+        # so a POST is never replayed into a duplicate record.
+        # Errors that survive the retries surface as RequestException below.
+        retry = _AirtableRetry(
+            status_forcelist=(429, 502, 503, 504),
+            allowed_methods=frozenset({'GET', 'PATCH', 'DELETE'}),
+            backoff_factor=Config.AIRTABLE_BACKOFF_FACTOR,
+            total=Config.AIRTABLE_MAX_RETRIES
+        )
+        self.api = Api(
+            Config.AIRTABLE_API_KEY,
+            timeout=(Config.AIRTABLE_CONNECT_TIMEOUT, Config.AIRTABLE_READ_TIMEOUT),
+            retry_strategy=retry
+        )
+
+        # Every table below shares this one session, so keep a pool of
+        # keep-alive connections large enough that requests reuse them
+        # instead of paying a fresh TLS handshake each time. With pool_block,
+        # concurrent workers beyond the pool size wait for a warm connection
+        # rather than opening one-off connections that are discarded after use.
+        # All requests also share one throttle, keeping concurrent workers under
+        # Airtable's per-base rate limit.
+        adapter = _ThrottledAdapter(
+            _RequestThrottle(Config.AIRTABLE_REQUESTS_PER_SECOND),
+            pool_maxsize=Config.AIRTABLE_POOL_SIZE,
+            max_retries=retry,
+            pool_block=True
+        )
+        self.api.session.mount('https://', adapter)
         self.base = self.api.base(Config.AIRTABLE_BASE_ID)
 
         # Initialize table references
@@ -28,6 +164,11 @@ class AirtableClient:
         self.salary_preferences = self.base.table(Config.TABLE_SALARY_PREFERENCES)
         self.shortlisted_leads = self.base.table(Config.TABLE_SHORTLISTED_LEADS)
 
+        # Child records indexed by applicant ID, populated by build_child_index()
+        self._personal_index: Optional[Dict[str, Dict[str, Any]]] = None
+        self._experience_index: Optional[Dict[str, List[Dict[str, Any]]]] = None
+        self._salary_index: Optional[Dict[str, Dict[str, Any]]] = None
+
     def get_applicant(self, applicant_id: str) -> Optional[Dict[str, Any]]:
         """
         Retrieve an applicant record by ID.
@@ -41,78 +182,268 @@ class AirtableClient:
         try:
             record = self.applicants.get(applicant_id)
             return record
-        except Exception as e:
+        except RequestException as e:
             logger.error(f"Error retrieving applicant {applicant_id}: {e}")
             return None
 
-    def get_all_applicants(self) -> List[Dict[str, Any]]:
+    def get_all_applicants(self, fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
         """
         Retrieve all applicant records.
 
+        Args:
+            fields: Optional list of field names to return (all fields if omitted)
+
         Returns:
             List of applicant records
         """
         try:
-            records = self.applicants.all()
+            records = self.applicants.all(fields=fields)
             return records
-        except Exception as e:
+        except RequestException as e:
             logger.error(f"Error retrieving all applicants: {e}")
             return []
 
-    def get_personal_details(self, applicant_id: str) -> Optional[Dict[str, Any]]:
+    def _get_applicants_with_blank(self, field: str) -> List[Dict[str, Any]]:
+        """Retrieve applicant records whose given field is empty, filtered server-side."""
+        try:
+            return self.applicants.all(formula=f"{FIELD(field)}=BLANK()", page_size=100)
+        except RequestException as e:
+            logger.error(f"Error retrieving applicants with blank {field}: {e}")
+            return []
+
+    def get_unevaluated_applicants(self) -> List[Dict[str, Any]]:
+        """
+        Retrieve applicants that have no LLM Summary yet.
+
+        Returns:
+            List of applicant records
+        """
+        return self._get_applicants_with_blank('LLM Summary')
+
+    def get_unshortlisted_applicants(self) -> List[Dict[str, Any]]:
+        """
+        Retrieve applicants that have no Shortlist Status yet.
+
+        Returns:
+            List of applicant records
+        """
+        return self._get_applicants_with_blank('Shortlist Status')
+
+    def iter_all_applicants(self, fields: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Iterate over all applicant records, fetching one page at a time.
+
+        Unlike get_all_applicants, processing can start after the first page
+        and only one page of records is held in memory at once.
+
+        Args:
+            fields: Optional list of field names to return (all fields if omitted)
+
+        Yields:
+            Applicant records
+
+        Raises:
+            RequestException: If a page cannot be fetched, so callers can tell a
+                listing that broke off partway from one that finished
+        """
+        for page in self.applicants.iterate(page_size=100, fields=fields):
+            yield from page
+
+    def get_personal_details(
+        self,
+        applicant_id: str,
+        fields: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Retrieve personal details linked to an applicant.
 
         Args:
             applicant_id: The Airtable record ID of the applicant
+            fields: Field names to return (defaults to PERSONAL_DETAILS_FIELDS)
 
         Returns:
             Personal details record or None
         """
         try:
-            formula = f"{{Applicant ID}} = '{applicant_id}'"
-            records = self.personal_details.all(formula=formula)
+            formula = match({'Applicant ID': applicant_id})
+            records = self.personal_details.all(
+                formula=formula, fields=fields or PERSONAL_DETAILS_FIELDS, max_records=1
+            )
             return records[0] if records else None
-        except Exception as e:
+        except RequestException as e:
             logger.error(f"Error retrieving personal details for {applicant_id}: {e}")
             return None
 
-    def get_work_experiences(self, applicant_id: str) -> List[Dict[str, Any]]:
+    def get_work_experiences(
+        self,
+        applicant_id: str,
+        fields: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
         """
         Retrieve all work experience records linked to an applicant.
 
         Args:
             applicant_id: The Airtable record ID of the applicant
+            fields: Field names to return (defaults to WORK_EXPERIENCE_FIELDS)
 
         Returns:
             List of work experience records
         """
         try:
-            formula = f"{{Applicant ID}} = '{applicant_id}'"
-            records = self.work_experience.all(formula=formula)
+            formula = match({'Applicant ID': applicant_id})
+            records = self.work_experience.all(
+                formula=formula, fields=fields or WORK_EXPERIENCE_FIELDS
+            )
             return records
-        except Exception as e:
+        except RequestException as e:
             logger.error(f"Error retrieving work experience for {applicant_id}: {e}")
             return []
 
-    def get_salary_preferences(self, applicant_id: str) -> Optional[Dict[str, Any]]:
+    def get_salary_preferences(
+        self,
+        applicant_id: str,
+        fields: Optional[List[str]] = None
+    ) -> Optional[Dict[str, Any]]:
         """
         Retrieve salary preferences linked to an applicant.
 
         Args:
             applicant_id: The Airtable record ID of the applicant
+            fields: Field names to return (defaults to SALARY_PREFERENCES_FIELDS)
 
         Returns:
             Salary preferences record or None
         """
         try:
-            formula = f"{{Applicant ID}} = '{applicant_id}'"
-            records = self.salary_preferences.all(formula=formula)
+            formula = match({'Applicant ID': applicant_id})
+            records = self.salary_preferences.all(
+                formula=formula, fields=fields or SALARY_PREFERENCES_FIELDS, max_records=1
+            )
             return records[0] if records else None
-        except Exception as e:
+        except RequestException as e:
             logger.error(f"Error retrieving salary preferences for {applicant_id}: {e}")
             return None
 
+    def build_child_index(self) -> bool:
+        """
+        Fetch every child table once and index the records by applicant ID.
+
+        Each per-applicant formula query makes Airtable scan the whole child
+        table; listing each table once and looking applicants up in memory
+        replaces N such scans with one. Batch jobs should call this up front
+        and then use the ``*_cached`` getters.
+
+        Returns:
+            True if the index was built, False otherwise
+        """
+        try:
+            personal = self.personal_details.all(fields=PERSONAL_DETAILS_FIELDS)
+            experiences = self.work_experience.all(fields=WORK_EXPERIENCE_FIELDS)
+            salary = self.salary_preferences.all(fields=SALARY_PREFERENCES_FIELDS)
+        except RequestException as e:
+            logger.error(f"Error building child record index: {e}")
+            return False
+
+        self._personal_index = _first_by_applicant(personal)
+        self._experience_index = _group_by_applicant(experiences)
+        self._salary_index = _first_by_applicant(salary)
+        logger.info(
+            f"Indexed {len(personal)} personal details, {len(experiences)} work experience "
+            f"and {len(salary)} salary preferences records"
+        )
+        return True
+
+    def get_personal_details_cached(self, applicant_id: str) -> Optional[Dict[str, Any]]:
+        """Get personal details from the child index, querying Airtable if it is not built."""
+        if self._personal_index is None:
+            return self.get_personal_details(applicant_id)
+        return self._personal_index.get(applicant_id)
+
+    def get_work_experiences_cached(self, applicant_id: str) -> List[Dict[str, Any]]:
+        """Get work experiences from the child index, querying Airtable if it is not built."""
+        if self._experience_index is None:
+            return self.get_work_experiences(applicant_id)
+        return self._experience_index.get(applicant_id, [])
+
+    def get_salary_preferences_cached(self, applicant_id: str) -> Optional[Dict[str, Any]]:
+        """Get salary preferences from the child index, querying Airtable if it is not built."""
+        if self._salary_index is None:
+            return self.get_salary_preferences(applicant_id)
+        return self._salary_index.get(applicant_id)
+
+    def _create(self, table: Table, fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Create a record in the given table."""
+        try:
+            record = table.create(fields)
+            logger.info(f"Created {table.name} record: {record['id']}")
+            return record
+        except RequestException as e:
+            logger.error(f"Error creating {table.name} record: {e}")
+            return None
+
+    def _update(
+        self,
+        table: Table,
+        record_id: str,
+        fields: Dict[str, Any]
+    ) -> Optional[Dict[str, Any]]:
+        """Update a record in the given table."""
+        try:
+            record = table.update(record_id, fields)
+            logger.info(f"Updated {table.name} record {record_id}")
+            return record
+        except RequestException as e:
+            logger.error(f"Error updating {table.name} record {record_id}: {e}")
+            return None
+
+    def _delete(self, table: Table, record_id: str) -> bool:
+        """Delete a record from the given table."""
+        try:
+            table.delete(record_id)
+            logger.info(f"Deleted {table.name} record {record_id}")
+            return True
+        except RequestException as e:
+            logger.error(f"Error deleting {table.name} record {record_id}: {e}")
+            return False
+
+    def _batch_create(
+        self,
+        table: Table,
+        records: List[Dict[str, Any]]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Create records in the given table; pyairtable splits them into requests of 10."""
+        try:
+            created = table.batch_create(records)
+            logger.info(f"Created {len(created)} {table.name} records")
+            return created
+        except RequestException as e:
+            logger.error(f"Error batch creating {table.name} records: {e}")
+            return None
+
+    def _batch_update(
+        self,
+        table: Table,
+        records: List[Dict[str, Any]]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Update ``{'id': ..., 'fields': ...}`` records in the given table in batched requests."""
+        try:
+            updated = table.batch_update(records)
+            logger.info(f"Updated {len(updated)} {table.name} records")
+            return updated
+        except RequestException as e:
+            logger.error(f"Error batch updating {table.name} records: {e}")
+            return None
+
+    def _batch_delete(self, table: Table, record_ids: List[str]) -> bool:
+        """Delete records from the given table in batched requests."""
+        try:
+            table.batch_delete(record_ids)
+            logger.info(f"Deleted {len(record_ids)} {table.name} records")
+            return True
+        except RequestException as e:
+            logger.error(f"Error batch deleting {table.name} records: {e}")
+            return False
+
     def update_applicant(self, applicant_id: str, fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Update an applicant record.
@@ -124,95 +455,98 @@ class AirtableClient:
         Returns:
             Updated record or None on failure
         """
-        try:
-            record = self.applicants.update(applicant_id, fields)
-            logger.info(f"Updated applicant {applicant_id}")
-            return record
-        except Exception as e:
-            logger.error(f"Error updating applicant {applicant_id}: {e}")
-            return None
+        return self._update(self.applicants, applicant_id, fields)
+
+    def batch_update_applicants(
+        self,
+        records: List[Dict[str, Any]]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Update several applicant records in batched requests.
+
+        Args:
+            records: List of ``{'id': ..., 'fields': ...}`` dictionaries
+
+        Returns:
+            Updated records or None on failure
+        """
+        return self._batch_update(self.applicants, records)
 
     def create_personal_details(self, fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Create a personal details record."""
-        try:
-            record = self.personal_details.create(fields)
-            logger.info(f"Created personal details record: {record['id']}")
-            return record
-        except Exception as e:
-            logger.error(f"Error creating personal details: {e}")
-            return None
+        return self._create(self.personal_details, fields)
 
     def update_personal_details(self, record_id: str, fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Update a personal details record."""
-        try:
-            record = self.personal_details.update(record_id, fields)
-            logger.info(f"Updated personal details {record_id}")
-            return record
-        except Exception as e:
-            logger.error(f"Error updating personal details {record_id}: {e}")
-            return None
+        return self._update(self.personal_details, record_id, fields)
 
     def create_work_experience(self, fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Create a work experience record."""
-        try:
-            record = self.work_experience.create(fields)
-            logger.info(f"Created work experience record: {record['id']}")
-            return record
-        except Exception as e:
-            logger.error(f"Error creating work experience: {e}")
-            return None
+        return self._create(self.work_experience, fields)
 
     def update_work_experience(self, record_id: str, fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Update a work experience record."""
-        try:
-            record = self.work_experience.update(record_id, fields)
-            logger.info(f"Updated work experience {record_id}")
-            return record
-        except Exception as e:
-            logger.error(f"Error updating work experience {record_id}: {e}")
-            return None
+        return self._update(self.work_experience, record_id, fields)
 
     def delete_work_experience(self, record_id: str) -> bool:
         """Delete a work experience record."""
-        try:
-            self.work_experience.delete(record_id)
-            logger.info(f"Deleted work experience {record_id}")
-            return True
-        except Exception as e:
-            logger.error(f"Error deleting work experience {record_id}: {e}")
-            return False
+        return self._delete(self.work_experience, record_id)
+
+    def batch_create_work_experience(
+        self,
+        records: List[Dict[str, Any]]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Create several work experience records in batched requests.
+
+        Args:
+            records: List of field dictionaries, one per record to create
+
+        Returns:
+            Created records or None on failure
+        """
+        return self._batch_create(self.work_experience, records)
+
+    def batch_update_work_experience(
+        self,
+        records: List[Dict[str, Any]]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Update several work experience records in batched requests.
+
+        Args:
+            records: List of ``{'id': ..., 'fields': ...}`` dictionaries
+
+        Returns:
+            Updated records or None on failure
+        """
+        return self._batch_update(self.work_experience, records)
+
+    def batch_delete_work_experience(self, record_ids: List[str]) -> bool:
+        """
+        Delete several work experience records in batched requests.
+
+        Args:
+            record_ids: Airtable record IDs to delete
+
+        Returns:
+            True if successful, False otherwise
+        """
+        return self._batch_delete(self.work_experience, record_ids)
 
     def create_salary_preferences(self, fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Create a salary preferences record."""
-        try:
-            record = self.salary_preferences.create(fields)
-            logger.info(f"Created salary preferences record: {record['id']}")
-            return record
-        except Exception as e:
-            logger.error(f"Error creating salary preferences: {e}")
-            return None
+        return self._create(self.salary_preferences, fields)
 
     def update_salary_preferences(self, record_id: str, fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Update a salary preferences record."""
-        try:
-            record = self.salary_preferences.update(record_id, fields)
-            logger.info(f"Updated salary preferences {record_id}")
-            return record
-        except Exception as e:
-            logger.error(f"Error updating salary preferences {record_id}: {e}")
-            return None
+        return self._update(self.salary_preferences, record_id, fields)
 
     def create_shortlisted_lead(self, fields: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """Create a shortlisted lead record."""
-        try:
-            record = self.shortlisted_leads.create(fields)
-            logger.info(f"Created shortlisted lead record: {record['id']}")
-            return record
-        except Exception as e:
-            logger.error(f"Error creating shortlisted lead: {e}")
-            return None
+        return self._create(self.shortlisted_leads, fields)
 
-    def check_shortlisted_lead_exists(self, applicant_id: str) -> bool:
+    def check_shortlisted_lead_exists(self, applicant_id: str) -> Optional[bool]:
         """
         Check if a shortlisted lead already exists for an applicant.
 
@@ -220,12 +554,14 @@ class AirtableClient:
             applicant_id: The Airtable record ID of the applicant
 
         Returns:
-            True if a shortlisted lead exists, False otherwise
+            True if a shortlisted lead exists, False if not, None if the check failed
         """
         try:
-            formula = f"{{Applicant}} = '{applicant_id}'"
-            records = self.shortlisted_leads.all(formula=formula)
-            return len(records) > 0
-        except Exception as e:
+            formula = match({'Applicant': applicant_id})
+            records = self.shortlisted_leads.all(
+                formula=formula, fields=['Applicant'], max_records=1
+            )
+            return bool(records)
+        except RequestException as e:
             logger.error(f"Error checking shortlisted lead for {applicant_id}: {e}")
-            return False
+            return None
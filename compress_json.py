@@ -4,11 +4,13 @@ Gathers data from three linked tables (Personal Details, Work Experience, Salary
 and compresses it into a single JSON object stored in the Applicants table.
 """
 
-import json
 import logging
-from typing import Dict, Any, Optional
-from datetime import datetime
-from airtable_utils import AirtableClient
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from requests.exceptions import RequestException
+from airtable_utils import AirtableClient, MAX_BATCH_RECORDS
+import json_utils
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -25,6 +27,7 @@ def calculate_total_experience(work_experiences: list) -> float:
         Total years of experience
     """
     total_years = 0.0
+    today = date.today()
 
     for exp in work_experiences:
         fields = exp.get('fields', {})
@@ -35,12 +38,14 @@ def calculate_total_experience(work_experiences: list) -> float:
             continue
 
         try:
-            start = datetime.strptime(start_date, '%Y-%m-%d')
+            # Airtable date fields are ISO YYYY-MM-DD; fromisoformat parses them in C,
+            # far faster than the generic strptime format machinery
+            start = date.fromisoformat(start_date)
             if end_date:
-                end = datetime.strptime(end_date, '%Y-%m-%d')
+                end = date.fromisoformat(end_date)
             else:
                 # If no end date, assume current
-                end = datetime.now()
+                end = today
 
             years = (end - start).days / 365.25
             total_years += years
@@ -51,13 +56,19 @@ def calculate_total_experience(work_experiences: list) -> float:
     return round(total_years, 1)
 
 
-def compress_applicant_data(client: AirtableClient, applicant_id: str) -> Optional[Dict[str, Any]]:
+def compress_applicant_data(
+    client: AirtableClient,
+    applicant_id: str,
+    use_child_index: bool = False
+) -> Optional[Dict[str, Any]]:
     """
     Compress data from multiple tables into a single JSON object.
 
     Args:
         client: AirtableClient instance
         applicant_id: The Airtable record ID of the applicant
+        use_child_index: Read child records from the client's child index
+            (see AirtableClient.build_child_index) instead of querying Airtable
 
     Returns:
         Compressed JSON data or None on failure
@@ -65,9 +76,19 @@ def compress_applicant_data(client: AirtableClient, applicant_id: str) -> Option
     logger.info(f"Compressing data for applicant: {applicant_id}")
 
     # Fetch data from all linked tables
-    personal = client.get_personal_details(applicant_id)
-    experiences = client.get_work_experiences(applicant_id)
-    salary = client.get_salary_preferences(applicant_id)
+    if use_child_index:
+        personal = client.get_personal_details_cached(applicant_id)
+        experiences = client.get_work_experiences_cached(applicant_id)
+        salary = client.get_salary_preferences_cached(applicant_id)
+    else:
+        # The three lookups are independent, so overlap their round-trips
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            personal_future = executor.submit(client.get_personal_details, applicant_id)
+            experiences_future = executor.submit(client.get_work_experiences, applicant_id)
+            salary_future = executor.submit(client.get_salary_preferences, applicant_id)
+            personal = personal_future.result()
+            experiences = experiences_future.result()
+            salary = salary_future.result()
 
     # Build compressed JSON structure
     compressed_data = {}
@@ -123,27 +144,33 @@ def compress_applicant_data(client: AirtableClient, applicant_id: str) -> Option
     return compressed_data
 
 
-def update_compressed_json(client: AirtableClient, applicant_id: str) -> bool:
+def update_compressed_json(
+    client: AirtableClient,
+    applicant_id: str,
+    compressed_data: Optional[Dict[str, Any]] = None
+) -> bool:
     """
     Compress applicant data and update the Compressed JSON field.
 
     Args:
         client: AirtableClient instance
         applicant_id: The Airtable record ID of the applicant
+        compressed_data: Already compressed data to write (compressed on demand if omitted)
 
     Returns:
         True if successful, False otherwise
     """
     try:
         # Compress the data
-        compressed_data = compress_applicant_data(client, applicant_id)
+        if compressed_data is None:
+            compressed_data = compress_applicant_data(client, applicant_id)
 
         if not compressed_data:
             logger.error(f"Failed to compress data for applicant {applicant_id}")
             return False
 
         # Convert to JSON string
-        json_string = json.dumps(compressed_data, indent=2)
+        json_string = json_utils.dumps(compressed_data)
 
         # Update the Applicants table
         result = client.update_applicant(applicant_id, {
@@ -162,29 +189,104 @@ def update_compressed_json(client: AirtableClient, applicant_id: str) -> bool:
         return False
 
 
-def compress_all_applicants(client: AirtableClient) -> None:
+def _write_compressed(client: AirtableClient, pending: List[Tuple[Dict[str, Any], str]]) -> bool:
     """
-    Compress data for all applicants in the database.
+    Write a batch of Compressed JSON payloads and refresh the records on success.
 
     Args:
         client: AirtableClient instance
+        pending: (applicant record, JSON string) pairs to write
+
+    Returns:
+        True if the batch was written, False otherwise
     """
-    logger.info("Starting compression for all applicants")
+    updates = [
+        {'id': record['id'], 'fields': {'Compressed JSON': json_string}}
+        for record, json_string in pending
+    ]
+    if client.batch_update_applicants(updates) is None:
+        return False
+
+    # Refresh the shared records only once Airtable holds the new payload, so
+    # later pipeline stages never act on JSON that was not saved
+    for record, json_string in pending:
+        record['fields']['Compressed JSON'] = json_string
+    return True
 
-    applicants = client.get_all_applicants()
-    logger.info(f"Found {len(applicants)} applicants to process")
+
+def compress_records(client: AirtableClient, records: Iterable[Dict[str, Any]]) -> None:
+    """
+    Compress data for the given applicant records.
+
+    Each record's Compressed JSON field is refreshed in place once its write
+    succeeds, so later pipeline stages can reuse the same records without
+    re-fetching them.
+
+    Args:
+        client: AirtableClient instance
+        records: Applicant records (at least their Compressed JSON field)
+    """
+    # Fetch each child table once for all applicants instead of once per applicant
+    if not client.build_child_index():
+        logger.error("Failed to fetch linked records; aborting compression")
+        return
 
     success_count = 0
+    skipped_count = 0
     failure_count = 0
+    pending = []
+    listing_complete = True
 
-    for applicant in applicants:
-        applicant_id = applicant['id']
-        if update_compressed_json(client, applicant_id):
-            success_count += 1
+    try:
+        for applicant in records:
+            applicant_id = applicant['id']
+            compressed_data = compress_applicant_data(client, applicant_id, use_child_index=True)
+            json_string = json_utils.dumps(compressed_data)
+
+            # Skip the write when the stored payload is already up to date
+            if applicant.setdefault('fields', {}).get('Compressed JSON') == json_string:
+                logger.info(f"Compressed JSON unchanged for applicant {applicant_id}")
+                skipped_count += 1
+                continue
+
+            pending.append((applicant, json_string))
+
+            # Write back in batches of up to 10 records per request
+            if len(pending) == MAX_BATCH_RECORDS:
+                if _write_compressed(client, pending):
+                    success_count += len(pending)
+                else:
+                    failure_count += len(pending)
+                pending = []
+    except RequestException as e:
+        # Records arrive page by page; a failed page ends the run early
+        logger.error(f"Error listing applicants; compression stopped early: {e}")
+        listing_complete = False
+
+    if pending:
+        if _write_compressed(client, pending):
+            success_count += len(pending)
         else:
-            failure_count += 1
+            failure_count += len(pending)
+
+    summary = f"{success_count} successful, {skipped_count} unchanged, {failure_count} failed"
+    if listing_complete:
+        logger.info(f"Compression complete: {summary}")
+    else:
+        logger.error(f"Compression incomplete: {summary}")
 
-    logger.info(f"Compression complete: {success_count} successful, {failure_count} failed")
+
+def compress_all_applicants(client: AirtableClient) -> None:
+    """
+    Compress data for all applicants in the database.
+
+    Args:
+        client: AirtableClient instance
+    """
+    logger.info("Starting compression for all applicants")
+
+    # Stream applicants page by page rather than listing them all up front
+    compress_records(client, client.iter_all_applicants(fields=['Compressed JSON']))
 
 
 def main():
@@ -204,6 +306,11 @@ def main():
         action='store_true',
         help='Compress data for all applicants'
     )
+    parser.add_argument(
+        '--pretty',
+        action='store_true',
+        help='Print the indented compressed JSON after compressing --applicant-id'
+    )
 
     args = parser.parse_args()
 
@@ -212,9 +319,14 @@ def main():
 
     if args.applicant_id:
         # Compress specific applicant
-        success = update_compressed_json(client, args.applicant_id)
+        compressed_data = None
+        if args.pretty:
+            compressed_data = compress_applicant_data(client, args.applicant_id)
+        success = update_compressed_json(client, args.applicant_id, compressed_data)
         if success:
             print(f"Successfully compressed data for applicant {args.applicant_id}")
+            if args.pretty:
+                print(json_utils.dumps(compressed_data, indent=True))
         else:
             print(f"Failed to compress data for applicant {args.applicant_id}")
     elif args.all:
@@ -4,19 +4,34 @@ Loads settings from environment variables and provides validation.
 """
 
 import os
-from typing import List
+from functools import lru_cache
+from typing import FrozenSet
 from dotenv import load_dotenv
 
 # Load environment variables from .env file
 load_dotenv()
 
 
+def _parse_csv(value: str) -> FrozenSet[str]:
+    """Parse a comma-separated setting into a set of trimmed, non-empty entries."""
+    return frozenset(item.strip() for item in value.split(',') if item.strip())
+
+
 class Config:
     """Application configuration loaded from environment variables."""
 
+    # Set once validate() has passed, so repeated client construction skips it
+    _validated: bool = False
+
     # Airtable Configuration
     AIRTABLE_API_KEY: str = os.getenv('AIRTABLE_API_KEY', '')
     AIRTABLE_BASE_ID: str = os.getenv('AIRTABLE_BASE_ID', '')
+    AIRTABLE_CONNECT_TIMEOUT: float = float(os.getenv('AIRTABLE_CONNECT_TIMEOUT', '5'))
+    AIRTABLE_READ_TIMEOUT: float = float(os.getenv('AIRTABLE_READ_TIMEOUT', '30'))
+    AIRTABLE_POOL_SIZE: int = int(os.getenv('AIRTABLE_POOL_SIZE', '20'))
+    AIRTABLE_MAX_RETRIES: int = int(os.getenv('AIRTABLE_MAX_RETRIES', '5'))
+    AIRTABLE_BACKOFF_FACTOR: float = float(os.getenv('AIRTABLE_BACKOFF_FACTOR', '2'))
+    AIRTABLE_REQUESTS_PER_SECOND: float = float(os.getenv('AIRTABLE_REQUESTS_PER_SECOND', '5'))
 
     # Table Names
     TABLE_APPLICANTS = 'Applicants'
@@ -33,23 +48,42 @@ class Config:
     GEMINI_API_KEY: str = os.getenv('GEMINI_API_KEY', '')
     MAX_TOKENS_PER_CALL: int = int(os.getenv('MAX_TOKENS_PER_CALL', '1000'))
     MAX_RETRIES: int = int(os.getenv('MAX_RETRIES', '3'))
+    CIRCUIT_BREAKER_THRESHOLD: int = int(os.getenv('CIRCUIT_BREAKER_THRESHOLD', '5'))
+    CIRCUIT_BREAKER_COOLDOWN: float = float(os.getenv('CIRCUIT_BREAKER_COOLDOWN', '60'))
+    LLM_CONCURRENCY: int = int(os.getenv('LLM_CONCURRENCY', '4'))
+    RPM_LIMIT: int = int(os.getenv('RPM_LIMIT', '60'))
+    TPM_LIMIT: int = int(os.getenv('TPM_LIMIT', '40000'))
+    LLM_MAX_PROFILE_CHARS: int = int(os.getenv('LLM_MAX_PROFILE_CHARS', '6000'))
+    LLM_STRUCTURED_OUTPUT: bool = os.getenv('LLM_STRUCTURED_OUTPUT', 'false').lower() == 'true'
+    LLM_CACHE_PATH: str = os.getenv('LLM_CACHE_PATH', 'llm_cache.db')
+    CACHE_TTL: int = int(os.getenv('CACHE_TTL', '604800'))
+    LLM_BATCH_SIZE: int = int(os.getenv('LLM_BATCH_SIZE', '1'))
+    MAX_COMPLETION_TOKENS: int = int(os.getenv('MAX_COMPLETION_TOKENS', '4096'))
+    USE_BATCH_API: bool = os.getenv('USE_BATCH_API', 'false').lower() == 'true'
+    BATCH_POLL_INTERVAL: int = int(os.getenv('BATCH_POLL_INTERVAL', '60'))
+
+    # Shortlist Processing
+    SHORTLIST_CONCURRENCY: int = int(os.getenv('SHORTLIST_CONCURRENCY', '8'))
 
     # Shortlist Criteria
-    TIER_1_COMPANIES: List[str] = os.getenv(
+    TIER_1_COMPANIES: FrozenSet[str] = _parse_csv(os.getenv(
         'TIER_1_COMPANIES',
         'Google,Meta,OpenAI,Microsoft,Amazon,Apple,Netflix,Anthropic'
-    ).split(',')
+    ))
     MAX_HOURLY_RATE: float = float(os.getenv('MAX_HOURLY_RATE', '100'))
     MIN_AVAILABILITY_HOURS: int = int(os.getenv('MIN_AVAILABILITY_HOURS', '20'))
     MIN_YEARS_EXPERIENCE: int = int(os.getenv('MIN_YEARS_EXPERIENCE', '4'))
-    APPROVED_LOCATIONS: List[str] = os.getenv(
+    APPROVED_LOCATIONS: FrozenSet[str] = _parse_csv(os.getenv(
         'APPROVED_LOCATIONS',
         'US,USA,United States,Canada,UK,United Kingdom,Germany,India'
-    ).split(',')
+    ))
 
     @classmethod
     def validate(cls) -> None:
         """Validate that required configuration is present."""
+        if cls._validated:
+            return
+
         errors = []
 
         if not cls.AIRTABLE_API_KEY:
@@ -68,6 +102,20 @@ class Config:
         if errors:
             raise ValueError("Configuration errors:\n" + "\n".join(f"  - {e}" for e in errors))
 
+        cls._validated = True
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def tier1_companies(cls) -> FrozenSet[str]:
+        """Get the Tier-1 company names, lowercased for case-insensitive matching."""
+        return frozenset(company.lower() for company in cls.TIER_1_COMPANIES)
+
+    @classmethod
+    @lru_cache(maxsize=None)
+    def approved_locations(cls) -> FrozenSet[str]:
+        """Get the approved locations, lowercased for case-insensitive matching."""
+        return frozenset(location.lower() for location in cls.APPROVED_LOCATIONS)
+
     @classmethod
     def get_llm_api_key(cls) -> str:
         """Get the appropriate API key based on the selected LLM provider."""
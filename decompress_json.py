@@ -7,7 +7,9 @@ child-table records to match the JSON state exactly.
 import json
 import logging
 from typing import Dict, Any, Optional, List
+from requests.exceptions import RequestException
 from airtable_utils import AirtableClient
+import json_utils
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -16,7 +18,8 @@ logger = logging.getLogger(__name__)
 def upsert_personal_details(
     client: AirtableClient,
     applicant_id: str,
-    personal_data: Dict[str, Any]
+    personal_data: Dict[str, Any],
+    use_child_index: bool = False
 ) -> bool:
     """
     Upsert personal details record.
@@ -25,13 +28,17 @@ def upsert_personal_details(
         client: AirtableClient instance
         applicant_id: The Airtable record ID of the applicant
         personal_data: Personal details from JSON
+        use_child_index: Look up existing records in the client's child index
 
     Returns:
         True if successful, False otherwise
     """
     try:
         # Check if record exists
-        existing = client.get_personal_details(applicant_id)
+        if use_child_index:
+            existing = client.get_personal_details_cached(applicant_id)
+        else:
+            existing = client.get_personal_details(applicant_id)
 
         fields = {
             'Applicant ID': [applicant_id],
@@ -58,7 +65,8 @@ def upsert_personal_details(
 def upsert_work_experiences(
     client: AirtableClient,
     applicant_id: str,
-    experience_data: List[Dict[str, Any]]
+    experience_data: List[Dict[str, Any]],
+    use_child_index: bool = False
 ) -> bool:
     """
     Upsert work experience records to match JSON state.
@@ -68,18 +76,23 @@ def upsert_work_experiences(
         client: AirtableClient instance
         applicant_id: The Airtable record ID of the applicant
         experience_data: List of work experiences from JSON
+        use_child_index: Look up existing records in the client's child index
 
     Returns:
         True if successful, False otherwise
     """
     try:
         # Get existing work experience records
-        existing_records = client.get_work_experiences(applicant_id)
+        if use_child_index:
+            existing_records = client.get_work_experiences_cached(applicant_id)
+        else:
+            existing_records = client.get_work_experiences(applicant_id)
 
-        # Track which records we've processed
-        processed_ids = set()
+        # Match JSON entries to existing records by index; extra JSON entries
+        # become new records and leftover existing records are deleted.
+        to_update = []
+        to_create = []
 
-        # Upsert each experience from JSON
         for idx, exp in enumerate(experience_data):
             fields = {
                 'Applicant ID': [applicant_id],
@@ -91,23 +104,26 @@ def upsert_work_experiences(
                 'Description': exp.get('description', '')
             }
 
-            # Try to match with existing record (by index or company name)
             if idx < len(existing_records):
-                record_id = existing_records[idx]['id']
-                client.update_work_experience(record_id, fields)
-                processed_ids.add(record_id)
+                to_update.append({'id': existing_records[idx]['id'], 'fields': fields})
             else:
-                # Create new record
-                new_record = client.create_work_experience(fields)
-                if new_record:
-                    processed_ids.add(new_record['id'])
+                to_create.append(fields)
+
+        to_delete = [existing['id'] for existing in existing_records[len(experience_data):]]
+
+        # Issue one batched call per operation instead of one call per record
+        success = True
+
+        if to_update and client.batch_update_work_experience(to_update) is None:
+            success = False
 
-        # Delete any existing records that weren't in the JSON
-        for existing in existing_records:
-            if existing['id'] not in processed_ids:
-                client.delete_work_experience(existing['id'])
+        if to_create and client.batch_create_work_experience(to_create) is None:
+            success = False
 
-        return True
+        if to_delete and not client.batch_delete_work_experience(to_delete):
+            success = False
+
+        return success
 
     except Exception as e:
         logger.error(f"Error upserting work experiences: {e}")
@@ -117,7 +133,8 @@ def upsert_work_experiences(
 def upsert_salary_preferences(
     client: AirtableClient,
     applicant_id: str,
-    salary_data: Dict[str, Any]
+    salary_data: Dict[str, Any],
+    use_child_index: bool = False
 ) -> bool:
     """
     Upsert salary preferences record.
@@ -126,13 +143,17 @@ def upsert_salary_preferences(
         client: AirtableClient instance
         applicant_id: The Airtable record ID of the applicant
         salary_data: Salary preferences from JSON
+        use_child_index: Look up existing records in the client's child index
 
     Returns:
         True if successful, False otherwise
     """
     try:
         # Check if record exists
-        existing = client.get_salary_preferences(applicant_id)
+        if use_child_index:
+            existing = client.get_salary_preferences_cached(applicant_id)
+        else:
+            existing = client.get_salary_preferences(applicant_id)
 
         fields = {
             'Applicant ID': [applicant_id],
@@ -156,27 +177,27 @@ def upsert_salary_preferences(
         return False
 
 
-def decompress_applicant_data(client: AirtableClient, applicant_id: str) -> bool:
+def decompress_applicant_data(
+    client: AirtableClient,
+    applicant: Dict[str, Any],
+    use_child_index: bool = False
+) -> bool:
     """
     Read Compressed JSON and update all child tables to match.
 
     Args:
         client: AirtableClient instance
-        applicant_id: The Airtable record ID of the applicant
+        applicant: Applicant record carrying at least the Compressed JSON field
+        use_child_index: Look up existing child records in the client's child index
+            (see AirtableClient.build_child_index) instead of querying Airtable
 
     Returns:
         True if successful, False otherwise
     """
+    applicant_id = applicant['id']
     logger.info(f"Decompressing data for applicant: {applicant_id}")
 
     try:
-        # Get the applicant record
-        applicant = client.get_applicant(applicant_id)
-
-        if not applicant:
-            logger.error(f"Applicant {applicant_id} not found")
-            return False
-
         # Get the Compressed JSON field
         compressed_json = applicant.get('fields', {}).get('Compressed JSON')
 
@@ -186,7 +207,7 @@ def decompress_applicant_data(client: AirtableClient, applicant_id: str) -> bool
 
         # Parse JSON
         try:
-            data = json.loads(compressed_json)
+            data = json_utils.loads(compressed_json)
         except json.JSONDecodeError as e:
             logger.error(f"Invalid JSON for applicant {applicant_id}: {e}")
             return False
@@ -196,19 +217,21 @@ def decompress_applicant_data(client: AirtableClient, applicant_id: str) -> bool
 
         # Personal Details
         if 'personal' in data:
-            if not upsert_personal_details(client, applicant_id, data['personal']):
+            if not upsert_personal_details(client, applicant_id, data['personal'], use_child_index):
                 success = False
                 logger.error("Failed to upsert personal details")
 
         # Work Experience
         if 'experience' in data:
-            if not upsert_work_experiences(client, applicant_id, data['experience']):
+            if not upsert_work_experiences(
+                client, applicant_id, data['experience'], use_child_index
+            ):
                 success = False
                 logger.error("Failed to upsert work experiences")
 
         # Salary Preferences
         if 'salary' in data:
-            if not upsert_salary_preferences(client, applicant_id, data['salary']):
+            if not upsert_salary_preferences(client, applicant_id, data['salary'], use_child_index):
                 success = False
                 logger.error("Failed to upsert salary preferences")
 
@@ -224,6 +247,26 @@ def decompress_applicant_data(client: AirtableClient, applicant_id: str) -> bool
         return False
 
 
+def decompress_applicant_by_id(client: AirtableClient, applicant_id: str) -> bool:
+    """
+    Fetch an applicant and decompress its Compressed JSON into the child tables.
+
+    Args:
+        client: AirtableClient instance
+        applicant_id: The Airtable record ID of the applicant
+
+    Returns:
+        True if successful, False otherwise
+    """
+    applicant = client.get_applicant(applicant_id)
+
+    if not applicant:
+        logger.error(f"Applicant {applicant_id} not found")
+        return False
+
+    return decompress_applicant_data(client, applicant)
+
+
 def decompress_all_applicants(client: AirtableClient) -> None:
     """
     Decompress data for all applicants in the database.
@@ -233,18 +276,28 @@ def decompress_all_applicants(client: AirtableClient) -> None:
     """
     logger.info("Starting decompression for all applicants")
 
-    applicants = client.get_all_applicants()
-    logger.info(f"Found {len(applicants)} applicants to process")
+    # Look up existing child records once for the whole run instead of per upsert
+    if not client.build_child_index():
+        logger.error("Failed to fetch linked records; aborting decompression")
+        return
 
     success_count = 0
     failure_count = 0
 
-    for applicant in applicants:
-        applicant_id = applicant['id']
-        if decompress_applicant_data(client, applicant_id):
-            success_count += 1
-        else:
-            failure_count += 1
+    # Stream applicants page by page; the listing already carries the JSON,
+    # so no per-applicant re-fetch is needed
+    try:
+        for applicant in client.iter_all_applicants(fields=['Compressed JSON']):
+            if decompress_applicant_data(client, applicant, use_child_index=True):
+                success_count += 1
+            else:
+                failure_count += 1
+    except RequestException as e:
+        logger.error(f"Error listing applicants; decompression stopped early: {e}")
+        logger.error(
+            f"Decompression incomplete: {success_count} successful, {failure_count} failed"
+        )
+        return
 
     logger.info(f"Decompression complete: {success_count} successful, {failure_count} failed")
 
@@ -274,7 +327,7 @@ def main():
 
     if args.applicant_id:
         # Decompress specific applicant
-        success = decompress_applicant_data(client, args.applicant_id)
+        success = decompress_applicant_by_id(client, args.applicant_id)
         if success:
             print(f"Successfully decompressed data for applicant {args.applicant_id}")
         else:
@@ -0,0 +1,54 @@
+"""
+JSON serialization helpers for the Compressed JSON payloads.
+Uses orjson when it is installed and falls back to the standard library otherwise.
+"""
+
+import json
+from typing import Any, Union
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def dumps(data: Any, indent: bool = False, sort_keys: bool = False) -> str:
+    """
+    Serialize data to a JSON string.
+
+    Output is compact by default; the stored payload is machine-read, so
+    whitespace only inflates every response that carries it.
+
+    Args:
+        data: JSON-serializable object
+        indent: Pretty-print with two-space indentation
+        sort_keys: Emit object keys in sorted order
+
+    Returns:
+        JSON string
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(data, option=option).decode()
+    if indent:
+        return json.dumps(data, indent=2, ensure_ascii=False, sort_keys=sort_keys)
+    return json.dumps(data, separators=(',', ':'), ensure_ascii=False, sort_keys=sort_keys)
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """
+    Parse a JSON string.
+
+    Raises json.JSONDecodeError on invalid input (orjson's error type subclasses it).
+
+    Args:
+        data: JSON text
+
+    Returns:
+        Parsed object
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
@@ -0,0 +1,95 @@
+"""
+Persistent exact-match cache for LLM responses.
+Stores responses in a local SQLite database keyed by a hash of the request,
+so re-running an evaluation on an unchanged profile costs no API call.
+"""
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+
+class LLMCache:
+    """Thread-safe SQLite-backed response cache with a time-to-live."""
+
+    def __init__(self, path: str, ttl: int):
+        """
+        Open (or create) the cache database.
+
+        Args:
+            path: SQLite database file path
+            ttl: Seconds an entry stays valid (0 means entries never expire)
+        """
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        # One connection shared by the evaluation worker threads, serialized by the lock
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS responses '
+            '(key TEXT PRIMARY KEY, response TEXT, created REAL)'
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def make_key(model: str, max_tokens: int, prompt: str) -> str:
+        """
+        Build the cache key for a request.
+
+        Args:
+            model: Model name
+            max_tokens: Completion budget
+            prompt: Full prompt text
+
+        Returns:
+            SHA-256 hex digest identifying the request
+        """
+        return hashlib.sha256(f"{model}|{max_tokens}|{prompt}".encode('utf-8')).hexdigest()
+
+    def get(self, key: str) -> Optional[str]:
+        """
+        Look up a cached response.
+
+        Args:
+            key: Cache key from make_key
+
+        Returns:
+            Cached response text or None if missing or expired
+        """
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT response, created FROM responses WHERE key = ?', (key,)
+            ).fetchone()
+
+            if row and (self.ttl <= 0 or time.time() - row[1] < self.ttl):
+                self.hits += 1
+                return row[0]
+
+            self.misses += 1
+            return None
+
+    def put(self, key: str, response: str) -> None:
+        """
+        Store a response, replacing any previous entry for the key.
+
+        Args:
+            key: Cache key from make_key
+            response: Response text to cache
+        """
+        with self._lock:
+            try:
+                self._conn.execute(
+                    'INSERT OR REPLACE INTO responses (key, response, created) VALUES (?, ?, ?)',
+                    (key, response, time.time())
+                )
+                self._conn.commit()
+            except sqlite3.Error as e:
+                logger.error(f"Error writing LLM cache entry: {e}")
@@ -8,13 +8,290 @@ import json
 import logging
 import time
 import re
-from typing import Dict, Any, Optional
-from airtable_utils import AirtableClient
+import sys
+import threading
+from itertools import takewhile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, Callable, List, Optional, Iterator, Tuple
+from tenacity import (
+    Retrying, RetryCallState, retry_if_exception, stop_after_attempt, wait_random_exponential
+)
+from airtable_utils import AirtableClient, MAX_BATCH_RECORDS
 from config import Config
+from llm_cache import LLMCache
+import json_utils
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
+# Static instructions are sent as the system prompt ahead of the applicant data,
+# so every request shares an identical prefix. Provider prompt caching only applies
+# to prefixes of at least 1024 tokens, which these instructions (~150-200 tokens) are
+# far below; the layout just lets caching engage if they ever grow past it.
+EVALUATION_INSTRUCTIONS = """\
+You are a recruiting analyst. Given a JSON applicant profile, do four things:
+
+1. Provide a concise 75-word summary of the candidate.
+2. Rate overall candidate quality from 1-10 (higher is better).
+3. List any data gaps or inconsistencies you notice.
+4. Suggest up to three follow-up questions to clarify gaps.
+
+Return only a JSON object, with no surrounding text, in exactly this shape:
+
+{"summary": "<text>", "score": <integer 1-10>, "issues": "<comma-separated list or 'None'>", \
+"follow_ups": ["<question 1>", "<question 2>", "<question 3>"]}
+
+If there are fewer than three follow-up questions, that's fine. Just list what's relevant."""
+
+BATCHED_EVALUATION_INSTRUCTIONS = """\
+You are a recruiting analyst. For EACH of the JSON applicant profiles you are given, \
+do four things:
+
+1. Provide a concise 75-word summary of the candidate.
+2. Rate overall candidate quality from 1-10 (higher is better).
+3. List any data gaps or inconsistencies you notice.
+4. Suggest up to three follow-up questions to clarify gaps.
+
+Return one block per applicant, in the same order, each consisting of a header line
+containing that applicant's ID exactly as given, followed by a JSON object in exactly this shape:
+
+=== Applicant <applicant ID> ===
+{"summary": "<text>", "score": <integer 1-10>, "issues": "<comma-separated list or 'None'>", \
+"follow_ups": ["<question 1>", "<question 2>", "<question 3>"]}
+
+If there are fewer than three follow-up questions, that's fine. Just list what's relevant."""
+
+# HTTP statuses below 500 that may succeed on retry (timeout, conflict, rate limit);
+# every 5xx is retried too, any other error is not
+RETRYABLE_STATUS_CODES = {408, 409, 429}
+
+# Full-jitter exponential backoff between LLM retries, in seconds
+RETRY_MAX_WAIT = 60
+_jittered_backoff = wait_random_exponential(multiplier=1, min=1, max=RETRY_MAX_WAIT)
+
+# Limits applied to applicant profiles that exceed LLM_MAX_PROFILE_CHARS
+_MAX_LLM_EXPERIENCES = 5
+_MAX_LLM_DESCRIPTION_CHARS = 200
+
+# JSON schema for a single evaluation, enforced by OpenAI structured outputs when enabled
+EVAL_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "summary": {"type": "string"},
+        "score": {"type": "integer", "description": "Overall candidate quality from 1 to 10"},
+        "issues": {"type": "string"},
+        "follow_ups": {"type": "array", "items": {"type": "string"}}
+    },
+    "required": ["summary", "score", "issues", "follow_ups"],
+    "additionalProperties": False
+}
+
+# Response patterns, compiled once rather than on every parse
+_CODE_FENCE_RE = re.compile(r'^```(?:json)?\s*|\s*```$')
+_APPLICANT_HEADER_RE = re.compile(r'=== Applicant (\S+) ===')
+
+# Response section headers (lowercased) for the plain-text fallback parser
+_SECTION_HEADERS = {
+    'summary': 'summary',
+    'score': 'score',
+    'issues': 'issues',
+    'follow-ups': 'follow_ups'
+}
+
+
+class RateLimiter:
+    """
+    Thread-safe requests-per-minute and tokens-per-minute throttle.
+
+    Both budgets refill continuously at ``limit / 60`` per second, capped at one
+    minute's worth. Each call waits just long enough for both budgets to cover
+    it, so requests are spaced to stay under quota instead of tripping 429s and
+    backing off. A limit of 0 disables that dimension.
+    """
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        """Start with a full minute of capacity."""
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.available_requests = float(requests_per_minute)
+        self.available_tokens = float(tokens_per_minute)
+        self.last_update = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        """Add the capacity accrued since the last update."""
+        now = time.monotonic()
+        elapsed = now - self.last_update
+        self.last_update = now
+        self.available_requests = min(
+            float(self.requests_per_minute),
+            self.available_requests + elapsed * self.requests_per_minute / 60
+        )
+        self.available_tokens = min(
+            float(self.tokens_per_minute),
+            self.available_tokens + elapsed * self.tokens_per_minute / 60
+        )
+
+    def acquire(self, tokens: int) -> None:
+        """
+        Block until one request and ``tokens`` tokens are available, then consume them.
+
+        Args:
+            tokens: Estimated total tokens (prompt + completion) for the call
+        """
+        # A single call larger than the whole budget must still be able to proceed
+        if self.tokens_per_minute > 0:
+            tokens = min(tokens, self.tokens_per_minute)
+
+        while True:
+            with self._lock:
+                self._refill()
+                requests_ok = self.requests_per_minute <= 0 or self.available_requests >= 1
+                tokens_ok = self.tokens_per_minute <= 0 or self.available_tokens >= tokens
+
+                if requests_ok and tokens_ok:
+                    if self.requests_per_minute > 0:
+                        self.available_requests -= 1
+                    if self.tokens_per_minute > 0:
+                        self.available_tokens -= tokens
+                    return
+
+                wait_time = 0.0
+                if not requests_ok:
+                    wait_time = (1 - self.available_requests) * 60 / self.requests_per_minute
+                if not tokens_ok:
+                    wait_time = max(
+                        wait_time, (tokens - self.available_tokens) * 60 / self.tokens_per_minute
+                    )
+
+            time.sleep(wait_time)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the provider while the circuit breaker is open."""
+
+
+class EmptyResponseError(ValueError):
+    """Raised when the provider answers without any text."""
+
+
+def _status_code(error: Exception) -> Optional[int]:
+    """Get the HTTP status of a provider SDK error, if it carries one."""
+    status = getattr(error, 'status_code', None)
+    if status is None:
+        # Gemini (google.api_core) errors carry the HTTP status in `code`
+        status = getattr(error, 'code', None)
+    try:
+        return int(status) if status is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_connection_error(error: BaseException) -> bool:
+    """Tell whether an error is a network failure or timeout."""
+    if isinstance(error, (ConnectionError, TimeoutError)):
+        return True
+
+    # The provider SDKs are imported lazily; one that was never loaded cannot have raised
+    for module_name in ('openai', 'anthropic'):
+        module = sys.modules.get(module_name)
+        if module is not None and isinstance(error, module.APIConnectionError):
+            return True
+    return False
+
+
+def _is_retryable(error: BaseException) -> bool:
+    """Retry only rate limits, server errors, network failures and empty answers."""
+    if isinstance(error, EmptyResponseError) or _is_connection_error(error):
+        return True
+
+    status = _status_code(error)
+    return status is not None and (status in RETRYABLE_STATUS_CODES or status >= 500)
+
+
+def _retry_wait(retry_state: RetryCallState) -> float:
+    """Wait for the provider's Retry-After if given, else full-jitter exponential backoff."""
+    error = retry_state.outcome.exception()
+    response = getattr(error, 'response', None)
+    retry_after = None
+    if response is not None:
+        retry_after = getattr(response, 'headers', {}).get('retry-after')
+
+    if retry_after:
+        try:
+            return min(float(retry_after), RETRY_MAX_WAIT)
+        except ValueError:
+            pass
+
+    return _jittered_backoff(retry_state)
+
+
+def _log_retry(retry_state: RetryCallState) -> None:
+    """Log a failed attempt before tenacity sleeps."""
+    logger.error(
+        f"LLM API call attempt {retry_state.attempt_number} failed: "
+        f"{retry_state.outcome.exception()}; "
+        f"retrying in {retry_state.next_action.sleep:.1f} seconds"
+    )
+
+
+class CircuitBreaker:
+    """
+    Thread-safe consecutive-failure circuit breaker.
+
+    After ``fail_threshold`` consecutive failed calls the breaker opens and
+    callers should skip the provider for ``cooldown`` seconds. Once the cooldown
+    passes the breaker is half-open: exactly one trial call is let through while
+    the rest keep being skipped. A success closes the breaker, while a failed
+    trial re-opens it for another cooldown.
+    """
+
+    def __init__(self, fail_threshold: int, cooldown: float):
+        """Start closed with no recorded failures."""
+        self.fail_threshold = fail_threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def is_open(self) -> bool:
+        """Return True while calls should be skipped."""
+        with self._lock:
+            if self.opened_at is None:
+                return False
+
+            if not self.trial_in_flight and time.monotonic() - self.opened_at >= self.cooldown:
+                # Half-open: let this one caller probe the provider
+                self.trial_in_flight = True
+                return False
+
+            return True
+
+    def record_failure(self) -> None:
+        """Count a failed call, opening the breaker at the threshold."""
+        with self._lock:
+            self.failures += 1
+            if self.trial_in_flight:
+                # The trial call failed: stay open for another cooldown
+                self.trial_in_flight = False
+                self.opened_at = time.monotonic()
+                return
+            threshold_reached = self.fail_threshold > 0 and self.failures >= self.fail_threshold
+            if threshold_reached and self.opened_at is None:
+                self.opened_at = time.monotonic()
+                logger.warning(
+                    f"LLM circuit breaker opened after {self.failures} consecutive failures; "
+                    f"pausing calls for {self.cooldown}s"
+                )
+
+    def record_success(self) -> None:
+        """Close the breaker and reset the failure count after a successful call."""
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
 
 class LLMEvaluator:
     """Wrapper for LLM API calls with retry logic."""
@@ -25,13 +302,21 @@ class LLMEvaluator:
         self.model = Config.LLM_MODEL
         self.max_tokens = Config.MAX_TOKENS_PER_CALL
         self.max_retries = Config.MAX_RETRIES
+        self.rate_limiter = RateLimiter(Config.RPM_LIMIT, Config.TPM_LIMIT)
+        self.breaker = CircuitBreaker(
+            Config.CIRCUIT_BREAKER_THRESHOLD, Config.CIRCUIT_BREAKER_COOLDOWN
+        )
+        self.cache = None
+        if Config.LLM_CACHE_PATH:
+            self.cache = LLMCache(Config.LLM_CACHE_PATH, Config.CACHE_TTL)
 
         if self.provider == 'openai':
             import openai
-            self.client = openai.OpenAI(api_key=Config.get_llm_api_key())
+            # Retries are handled in call_llm, so disable the SDK's own
+            self.client = openai.OpenAI(api_key=Config.get_llm_api_key(), max_retries=0)
         elif self.provider == 'anthropic':
             import anthropic
-            self.client = anthropic.Anthropic(api_key=Config.get_llm_api_key())
+            self.client = anthropic.Anthropic(api_key=Config.get_llm_api_key(), max_retries=0)
         elif self.provider == 'gemini':
             import google.generativeai as genai
             genai.configure(api_key=Config.get_llm_api_key())
@@ -39,131 +324,442 @@ class LLMEvaluator:
         else:
             raise ValueError(f"Unsupported LLM provider: {self.provider}")
 
-    def _call_openai(self, prompt: str) -> Optional[str]:
-        """Call OpenAI API."""
+    def _openai_request_body(
+        self,
+        prompt: str,
+        max_tokens: Optional[int] = None,
+        system: str = EVALUATION_INSTRUCTIONS
+    ) -> Dict[str, Any]:
+        """Build the chat-completions request body shared by sync and batch calls."""
+        body = {
+            'model': self.model,
+            'messages': [
+                {"role": "system", "content": system},
+                {"role": "user", "content": prompt}
+            ],
+            'max_tokens': max_tokens or self.max_tokens,
+            # Scoring should be deterministic, which also makes responses safe to cache
+            'temperature': 0
+        }
+
+        # Packed prompts answer with several delimited objects, so only a
+        # single-applicant evaluation can be held to the schema
+        if Config.LLM_STRUCTURED_OUTPUT and system == EVALUATION_INSTRUCTIONS:
+            body['response_format'] = {
+                'type': 'json_schema',
+                'json_schema': {'name': 'evaluation', 'schema': EVAL_SCHEMA, 'strict': True}
+            }
+
+        return body
+
+    def _call_openai(
+        self,
+        prompt: str,
+        max_tokens: Optional[int] = None,
+        system: str = EVALUATION_INSTRUCTIONS
+    ) -> Optional[str]:
+        """Call OpenAI API. Errors propagate to call_llm for retry handling."""
+        # The system prompt comes first so a long enough one (1024+ tokens) would be
+        # cached by OpenAI automatically
+        response = self.client.chat.completions.create(
+            **self._openai_request_body(prompt, max_tokens, system)
+        )
+        return response.choices[0].message.content
+
+    def _call_anthropic(
+        self,
+        prompt: str,
+        max_tokens: Optional[int] = None,
+        system: str = EVALUATION_INSTRUCTIONS
+    ) -> Optional[str]:
+        """Call Anthropic API. Errors propagate to call_llm for retry handling."""
+        response = self.client.messages.create(
+            model=self.model,
+            max_tokens=max_tokens or self.max_tokens,
+            temperature=0,
+            # Cache breakpoint for the shared instructions; Anthropic ignores it
+            # until they reach the 1024-token minimum
+            system=[{"type": "text", "text": system, "cache_control": {"type": "ephemeral"}}],
+            messages=[
+                {"role": "user", "content": prompt}
+            ]
+        )
+        return response.content[0].text
+
+    def _call_gemini(self, prompt: str, system: str = EVALUATION_INSTRUCTIONS) -> Optional[str]:
+        """Call Google Gemini API. Errors propagate to call_llm for retry handling."""
+        response = self.client.generate_content(
+            f"{system}\n\n{prompt}",
+            generation_config={'temperature': 0}
+        )
+        return response.text
+
+    def _dispatch(self, prompt: str, max_tokens: int, system: str, estimated_tokens: int) -> str:
+        """
+        Make one rate-limited provider call and record its outcome on the circuit breaker.
+
+        Raises:
+            CircuitOpenError: If the breaker is open
+            Exception: Provider errors, or EmptyResponseError for an empty response
+        """
+        if self.breaker.is_open():
+            raise CircuitOpenError("LLM circuit breaker is open")
+
+        # Wait for rate-limit capacity before dispatching rather than after a 429
+        self.rate_limiter.acquire(estimated_tokens)
+
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "You are a recruiting analyst evaluating candidate profiles."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=self.max_tokens,
-                temperature=0.7
-            )
-            return response.choices[0].message.content
+            if self.provider == 'openai':
+                response = self._call_openai(prompt, max_tokens, system)
+            elif self.provider == 'anthropic':
+                response = self._call_anthropic(prompt, max_tokens, system)
+            else:
+                response = self._call_gemini(prompt, system)
+
+            if not response:
+                raise EmptyResponseError("Empty response from LLM")
         except Exception as e:
-            logger.error(f"OpenAI API error: {e}")
-            return None
+            # A non-retryable error status (bad request, unknown model, ...) still
+            # means the provider answered, so it counts as a healthy call
+            if not _is_retryable(e) and _status_code(e) is not None:
+                self.breaker.record_success()
+            else:
+                self.breaker.record_failure()
+            raise
+
+        self.breaker.record_success()
+        return response
+
+    def cache_key(
+        self,
+        prompt: str,
+        max_tokens: Optional[int] = None,
+        system: str = EVALUATION_INSTRUCTIONS
+    ) -> str:
+        """
+        Build the response-cache key for a request.
+
+        Args:
+            prompt: The prompt to send to the LLM
+            max_tokens: Completion budget (defaults to MAX_TOKENS_PER_CALL)
+            system: Static instructions sent ahead of the prompt
+
+        Returns:
+            Cache key shared by synchronous and Batch API calls for the same request
+        """
+        return LLMCache.make_key(self.model, max_tokens or self.max_tokens, f"{system}\n\n{prompt}")
+
+    def call_llm(
+        self,
+        prompt: str,
+        max_tokens: Optional[int] = None,
+        system: str = EVALUATION_INSTRUCTIONS,
+        is_valid: Optional[Callable[[str], bool]] = None
+    ) -> Optional[str]:
+        """
+        Call LLM API with retry logic.
+
+        Retries rate limits, server and network errors with full-jitter exponential
+        backoff, honoring the provider's Retry-After header when it sends one.
+
+        Args:
+            prompt: The prompt to send to the LLM
+            max_tokens: Completion budget for this call (defaults to MAX_TOKENS_PER_CALL)
+            system: Static instructions sent ahead of the prompt
+            is_valid: Check that a response is usable; only responses passing it
+                are cached or served from the cache
+
+        Returns:
+            LLM response text or None on failure
+        """
+        max_tokens = max_tokens or self.max_tokens
+
+        # Identical requests at temperature 0 give the same answer, so serve repeats from cache
+        cache_key = None
+        if self.cache is not None:
+            cache_key = self.cache_key(prompt, max_tokens, system)
+            cached = self.cache.get(cache_key)
+            if cached is not None and (is_valid is None or is_valid(cached)):
+                logger.info("Using cached LLM response")
+                return cached
+
+        # Rough token estimate: ~4 characters per prompt token plus the completion budget
+        estimated_tokens = (len(system) + len(prompt)) // 4 + max_tokens
+
+        retryer = Retrying(
+            stop=stop_after_attempt(self.max_retries),
+            wait=_retry_wait,
+            retry=retry_if_exception(_is_retryable),
+            before_sleep=_log_retry,
+            reraise=True
+        )
 
-    def _call_anthropic(self, prompt: str) -> Optional[str]:
-        """Call Anthropic API."""
         try:
-            response = self.client.messages.create(
-                model=self.model,
-                max_tokens=self.max_tokens,
-                messages=[
-                    {"role": "user", "content": prompt}
-                ]
-            )
-            return response.content[0].text
+            response = retryer(self._dispatch, prompt, max_tokens, system, estimated_tokens)
         except Exception as e:
-            logger.error(f"Anthropic API error: {e}")
+            logger.error(f"LLM API call failed: {e}")
             return None
 
-    def _call_gemini(self, prompt: str) -> Optional[str]:
-        """Call Google Gemini API."""
+        # Caching an unusable answer would replay it on every later run
+        if cache_key is not None and (is_valid is None or is_valid(response)):
+            self.cache.put(cache_key, response)
+        return response
+
+    def submit_batch(self, prompts: Dict[str, str]) -> Optional[str]:
+        """
+        Submit prompts as one OpenAI Batch API job.
+
+        Batch jobs are billed at roughly half the synchronous price and do not
+        count against the per-minute rate limits, at the cost of completing
+        asynchronously (within 24 hours).
+
+        Args:
+            prompts: Mapping of applicant ID to prompt; the ID is used as the custom_id
+
+        Returns:
+            Batch ID or None on failure
+        """
+        if self.provider != 'openai':
+            logger.error(f"Batch API is not supported for provider: {self.provider}")
+            return None
+
+        lines = [
+            json_utils.dumps({
+                'custom_id': applicant_id,
+                'method': 'POST',
+                'url': '/v1/chat/completions',
+                'body': self._openai_request_body(prompt)
+            })
+            for applicant_id, prompt in prompts.items()
+        ]
+
         try:
-            response = self.client.generate_content(prompt)
-            return response.text
+            input_file = self.client.files.create(
+                file=('batch_input.jsonl', '\n'.join(lines).encode('utf-8')),
+                purpose='batch'
+            )
+            batch = self.client.batches.create(
+                input_file_id=input_file.id,
+                endpoint='/v1/chat/completions',
+                completion_window='24h'
+            )
+            logger.info(f"Submitted batch {batch.id} with {len(lines)} requests")
+            return batch.id
         except Exception as e:
-            logger.error(f"Gemini API error: {e}")
+            logger.error(f"Error submitting batch: {e}")
             return None
 
-    def call_llm(self, prompt: str) -> Optional[str]:
+    def poll_batch(self, batch_id: str) -> Iterator[Tuple[str, Optional[str]]]:
         """
-        Call LLM API with retry logic.
+        Wait for a batch job to finish and yield its results.
 
         Args:
-            prompt: The prompt to send to the LLM
+            batch_id: ID returned by submit_batch
 
-        Returns:
-            LLM response text or None on failure
+        Yields:
+            (custom_id, response text) pairs; the text is None for failed requests
         """
-        for attempt in range(self.max_retries):
-            try:
-                if self.provider == 'openai':
-                    response = self._call_openai(prompt)
-                elif self.provider == 'anthropic':
-                    response = self._call_anthropic(prompt)
-                elif self.provider == 'gemini':
-                    response = self._call_gemini(prompt)
-                else:
-                    return None
-
-                if response:
-                    return response
-
-            except Exception as e:
-                logger.error(f"LLM API call attempt {attempt + 1} failed: {e}")
-
-            # Exponential backoff
-            if attempt < self.max_retries - 1:
-                wait_time = 2 ** attempt
-                logger.info(f"Retrying in {wait_time} seconds...")
-                time.sleep(wait_time)
-
-        logger.error(f"All {self.max_retries} LLM API call attempts failed")
-        return None
+        try:
+            while True:
+                batch = self.client.batches.retrieve(batch_id)
+                if batch.status == 'completed':
+                    break
+                if batch.status in ('failed', 'expired', 'cancelled'):
+                    logger.error(f"Batch {batch_id} ended with status {batch.status}")
+                    return
+                logger.info(
+                    f"Batch {batch_id} is {batch.status}; "
+                    f"checking again in {Config.BATCH_POLL_INTERVAL}s"
+                )
+                time.sleep(Config.BATCH_POLL_INTERVAL)
+
+            if not batch.output_file_id:
+                logger.error(f"Batch {batch_id} completed without an output file")
+                return
+
+            output = self.client.files.content(batch.output_file_id).text
+        except Exception as e:
+            logger.error(f"Error polling batch {batch_id}: {e}")
+            return
+
+        for line in output.splitlines():
+            if not line.strip():
+                continue
+            result = json_utils.loads(line)
+            response = result.get('response') or {}
+            if response.get('status_code') != 200:
+                logger.error(
+                    f"Batch request {result.get('custom_id')} failed: {result.get('error')}"
+                )
+                yield result.get('custom_id'), None
+                continue
+            yield result['custom_id'], response['body']['choices'][0]['message']['content']
+
+
+def _truncate_for_llm(
+    compressed_json: str,
+    char_budget: Optional[int] = None,
+    parsed_data: Optional[Dict[str, Any]] = None
+) -> str:
+    """
+    Prepare an applicant profile for the prompt.
+
+    The JSON is re-serialized compactly with sorted keys, so profiles that differ
+    only in whitespace or key order produce the same prompt and response-cache
+    key. Profiles longer than the character budget keep personal details, salary
+    and total experience but only the most recent work experiences, with long
+    descriptions cut short, so one long history cannot blow the context window.
+
+    Args:
+        compressed_json: JSON string of applicant data
+        char_budget: Maximum profile length (defaults to LLM_MAX_PROFILE_CHARS; 0 disables trimming)
+        parsed_data: Already parsed compressed_json (skips re-parsing it; never modified)
 
+    Returns:
+        Prepared JSON string, or the input unchanged if it does not parse
+    """
+    if char_budget is None:
+        char_budget = Config.LLM_MAX_PROFILE_CHARS
 
-def build_evaluation_prompt(compressed_json: str) -> str:
+    if parsed_data is not None:
+        # Shallow copy: trimming below replaces keys rather than editing them
+        data = dict(parsed_data)
+    else:
+        try:
+            data = json_utils.loads(compressed_json)
+        except json.JSONDecodeError:
+            return compressed_json
+
+    profile = json_utils.dumps(data, sort_keys=True)
+    if char_budget <= 0 or len(profile) <= char_budget or not isinstance(data, dict):
+        return profile
+
+    # Ongoing roles have no end date and count as the most recent
+    experiences = sorted(
+        data.get('experience') or [],
+        key=lambda exp: exp.get('end_date') or '9999-12-31',
+        reverse=True
+    )[:_MAX_LLM_EXPERIENCES]
+
+    data['experience'] = [
+        {**exp, 'description': (exp.get('description') or '')[:_MAX_LLM_DESCRIPTION_CHARS]}
+        for exp in experiences
+    ]
+
+    logger.info(f"Trimmed applicant profile of {len(profile)} characters to fit the prompt budget")
+    return json_utils.dumps(data, sort_keys=True)
+
+
+def build_evaluation_prompt(
+    compressed_json: str,
+    parsed_data: Optional[Dict[str, Any]] = None
+) -> str:
     """
     Build the LLM prompt for evaluating an applicant.
 
+    Only the applicant-specific part is built here; the instructions are sent
+    separately as the EVALUATION_INSTRUCTIONS system prompt.
+
     Args:
         compressed_json: JSON string of applicant data
+        parsed_data: Already parsed compressed_json (skips re-parsing it)
 
     Returns:
         Formatted prompt string
     """
-    prompt = f"""You are a recruiting analyst. Given this JSON applicant profile, do four things:
+    profile = _truncate_for_llm(compressed_json, parsed_data=parsed_data)
+    return f"Applicant Profile:\n```json\n{profile}\n```"
 
-1. Provide a concise 75-word summary of the candidate.
-2. Rate overall candidate quality from 1-10 (higher is better).
-3. List any data gaps or inconsistencies you notice.
-4. Suggest up to three follow-up questions to clarify gaps.
 
-Applicant Profile:
-```json
-{compressed_json}
-```
+def build_batched_evaluation_prompt(items: List[Tuple[str, str]]) -> str:
+    """
+    Build one LLM prompt that evaluates several applicants at once.
 
-Return your response in exactly this format:
+    Sent with the BATCHED_EVALUATION_INSTRUCTIONS system prompt, so the
+    instructions go out once for the whole group instead of once per applicant.
+    Each answer is delimited by the applicant's record ID so the response can be
+    split back up with parse_batched_llm_response.
 
-Summary: <text>
-Score: <integer>
-Issues: <comma-separated list or 'None'>
-Follow-Ups:
-- <question 1>
-- <question 2>
-- <question 3>
+    Args:
+        items: (applicant ID, compressed JSON string) pairs
 
-If there are fewer than three follow-up questions, that's fine. Just list what's relevant.
-"""
-    return prompt
+    Returns:
+        Formatted prompt string
+    """
+    return "\n\n".join(
+        f"### Applicant {index}: {applicant_id}\n```json\n{_truncate_for_llm(compressed_json)}\n```"
+        for index, (applicant_id, compressed_json) in enumerate(items, start=1)
+    )
 
 
-def parse_llm_response(response: str) -> Dict[str, Any]:
+def _parse_json_response(response: str) -> Optional[Dict[str, Any]]:
+    """
+    Parse a JSON evaluation object, tolerating a code fence or text around it.
+
+    Args:
+        response: Raw LLM response text
+
+    Returns:
+        Dictionary with parsed fields, or None if the response holds no JSON object
+    """
+    text = _CODE_FENCE_RE.sub('', response.strip())
+
+    # Models sometimes wrap the object in prose ("Here is my evaluation: {...}"),
+    # so fall back to the outermost {...} span
+    start, end = text.find('{'), text.rfind('}')
+    candidates = [text]
+    if 0 <= start < end and (start, end) != (0, len(text) - 1):
+        candidates.append(text[start:end + 1])
+
+    data = None
+    for candidate in candidates:
+        try:
+            data = json_utils.loads(candidate)
+            break
+        except json.JSONDecodeError:
+            continue
+
+    if not isinstance(data, dict):
+        return None
+
+    try:
+        score = int(data.get('score') or 0)
+    except (TypeError, ValueError):
+        score = 0
+
+    issues = data.get('issues') or ''
+    if isinstance(issues, list):
+        issues = ', '.join(str(issue) for issue in issues)
+
+    follow_ups = data.get('follow_ups') or []
+    if isinstance(follow_ups, list):
+        follow_ups = '\n'.join(f"- {question}" for question in follow_ups)
+
+    return {
+        'summary': str(data.get('summary') or '').strip(),
+        'score': score,
+        'issues': str(issues).strip(),
+        'follow_ups': str(follow_ups).strip()
+    }
+
+
+def parse_llm_response(response: str) -> Optional[Dict[str, Any]]:
     """
     Parse the structured response from the LLM.
 
+    Expects the JSON object requested by EVALUATION_INSTRUCTIONS and falls back
+    to the plain-text "Summary:/Score:/Issues:/Follow-Ups:" layout.
+
     Args:
         response: Raw LLM response text
 
     Returns:
-        Dictionary with parsed fields
+        Dictionary with parsed fields, or None if no summary could be extracted
     """
+    parsed = _parse_json_response(response)
+    if parsed is not None:
+        return parsed if parsed['summary'] else None
+
     result = {
         'summary': '',
         'score': 0,
@@ -171,38 +767,127 @@ def parse_llm_response(response: str) -> Dict[str, Any]:
         'follow_ups': ''
     }
 
+    # Single pass over the lines: a "Header:" line switches the current section
+    # and following lines are appended to it until the next header
+    sections = {'summary': [], 'issues': [], 'follow_ups': []}
+    current = None
+
     try:
-        # Extract Summary
-        summary_match = re.search(r'Summary:\s*(.+?)(?=\n(?:Score:|$))', response, re.DOTALL | re.IGNORECASE)
-        if summary_match:
-            result['summary'] = summary_match.group(1).strip()
-
-        # Extract Score
-        score_match = re.search(r'Score:\s*(\d+)', response, re.IGNORECASE)
-        if score_match:
-            result['score'] = int(score_match.group(1))
-
-        # Extract Issues
-        issues_match = re.search(r'Issues:\s*(.+?)(?=\n(?:Follow-Ups:|$))', response, re.DOTALL | re.IGNORECASE)
-        if issues_match:
-            result['issues'] = issues_match.group(1).strip()
-
-        # Extract Follow-Ups
-        followups_match = re.search(r'Follow-Ups:\s*(.+?)$', response, re.DOTALL | re.IGNORECASE)
-        if followups_match:
-            result['follow_ups'] = followups_match.group(1).strip()
+        for line in response.splitlines():
+            header, separator, rest = line.strip().partition(':')
+            section = _SECTION_HEADERS.get(header.lower()) if separator else None
+
+            if section == 'score':
+                digits = ''.join(takewhile(str.isdigit, rest.strip()))
+                if digits:
+                    result['score'] = int(digits)
+                current = None
+            elif section:
+                current = section
+                if rest.strip():
+                    sections[current].append(rest.strip())
+            elif current is not None:
+                sections[current].append(line)
+
+        for section, lines in sections.items():
+            result[section] = '\n'.join(lines).strip()
 
     except Exception as e:
         logger.error(f"Error parsing LLM response: {e}")
 
-    return result
+    # Without a summary the answer is unusable; never write a blank evaluation
+    return result if result['summary'] else None
+
+
+def parse_batched_llm_response(response: str) -> Dict[str, Dict[str, Any]]:
+    """
+    Split a multi-applicant response into per-applicant parsed fields.
+
+    Args:
+        response: Raw LLM response to a build_batched_evaluation_prompt prompt
+
+    Returns:
+        Dictionary mapping applicant ID to parsed fields (unparseable blocks are left out)
+    """
+    # Splitting on a pattern with a capture group yields [preamble, id1, block1, id2, block2, ...]
+    parts = _APPLICANT_HEADER_RE.split(response)
+
+    results = {}
+    for applicant_id, block in zip(parts[1::2], parts[2::2]):
+        parsed = parse_llm_response(block)
+        if parsed is not None:
+            results[applicant_id] = parsed
+    return results
+
+
+def _evaluation_fields(parsed: Dict[str, Any]) -> Dict[str, Any]:
+    """Map parsed LLM output onto the Applicants table fields."""
+    return {
+        'LLM Summary': parsed['summary'],
+        'LLM Score': parsed['score'],
+        'LLM Issues': parsed['issues'],
+        'LLM Follow-Ups': parsed['follow_ups']
+    }
+
+
+def _evaluate_record(
+    llm_evaluator: LLMEvaluator,
+    applicant: Dict[str, Any],
+    parsed_data: Optional[Dict[str, Any]] = None
+) -> Optional[Dict[str, Any]]:
+    """
+    Run the LLM evaluation for an applicant record without writing it back.
+
+    Args:
+        llm_evaluator: LLMEvaluator instance
+        applicant: Applicant record carrying the Compressed JSON field
+        parsed_data: Already parsed Compressed JSON (skips re-parsing it)
+
+    Returns:
+        Applicant fields to update, or None on failure
+    """
+    applicant_id = applicant['id']
+    compressed_json = applicant.get('fields', {}).get('Compressed JSON')
+
+    if not compressed_json:
+        logger.warning(f"No Compressed JSON for applicant {applicant_id}")
+        return None
+
+    try:
+        # Build prompt
+        prompt = build_evaluation_prompt(compressed_json, parsed_data)
+
+        # Call LLM
+        logger.info(f"Calling {llm_evaluator.provider} API for applicant {applicant_id}...")
+        response = llm_evaluator.call_llm(
+            prompt, is_valid=lambda text: parse_llm_response(text) is not None
+        )
+
+        if not response:
+            logger.error(f"Failed to get LLM response for applicant {applicant_id}")
+            return None
+
+        # Parse response
+        parsed = parse_llm_response(response)
+        if parsed is None:
+            logger.error(f"Could not parse LLM response for applicant {applicant_id}")
+            return None
+
+        logger.info(f"Applicant {applicant_id} score: {parsed['score']}/10")
+        return _evaluation_fields(parsed)
+
+    except Exception as e:
+        logger.error(f"Error evaluating applicant {applicant_id}: {e}")
+        return None
 
 
 def evaluate_applicant_with_llm(
     client: AirtableClient,
     llm_evaluator: LLMEvaluator,
     applicant_id: str,
-    force: bool = False
+    force: bool = False,
+    prefetched: Optional[Dict[str, Any]] = None,
+    parsed_data: Optional[Dict[str, Any]] = None
 ) -> bool:
     """
     Evaluate an applicant using LLM and update their record.
@@ -212,6 +897,8 @@ def evaluate_applicant_with_llm(
         llm_evaluator: LLMEvaluator instance
         applicant_id: The Airtable record ID of the applicant
         force: Force re-evaluation even if already evaluated
+        prefetched: Applicant record already fetched by the caller (skips the lookup)
+        parsed_data: Already parsed Compressed JSON (skips re-parsing it)
 
     Returns:
         True if successful, False otherwise
@@ -220,50 +907,25 @@ def evaluate_applicant_with_llm(
 
     try:
         # Get applicant record
-        applicant = client.get_applicant(applicant_id)
+        applicant = prefetched or client.get_applicant(applicant_id)
         if not applicant:
             logger.error(f"Applicant {applicant_id} not found")
             return False
 
-        fields = applicant.get('fields', {})
-        compressed_json = fields.get('Compressed JSON')
-
-        if not compressed_json:
-            logger.warning(f"No Compressed JSON for applicant {applicant_id}")
-            return False
-
         # Check if already evaluated (unless forced)
-        if not force and fields.get('LLM Summary'):
+        if not force and applicant.get('fields', {}).get('LLM Summary'):
             logger.info(f"Applicant {applicant_id} already evaluated. Use --force to re-evaluate.")
             return True
 
-        # Build prompt
-        prompt = build_evaluation_prompt(compressed_json)
-
-        # Call LLM
-        logger.info(f"Calling {llm_evaluator.provider} API...")
-        response = llm_evaluator.call_llm(prompt)
-
-        if not response:
-            logger.error(f"Failed to get LLM response for applicant {applicant_id}")
+        update_fields = _evaluate_record(llm_evaluator, applicant, parsed_data)
+        if update_fields is None:
             return False
 
-        # Parse response
-        parsed = parse_llm_response(response)
-
         # Update applicant record
-        update_fields = {
-            'LLM Summary': parsed['summary'],
-            'LLM Score': parsed['score'],
-            'LLM Issues': parsed['issues'],
-            'LLM Follow-Ups': parsed['follow_ups']
-        }
-
         result = client.update_applicant(applicant_id, update_fields)
 
         if result:
             logger.info(f"Successfully updated LLM evaluation for applicant {applicant_id}")
-            logger.info(f"Score: {parsed['score']}/10")
             return True
         else:
             logger.error(f"Failed to update applicant {applicant_id}")
@@ -274,47 +936,281 @@ def evaluate_applicant_with_llm(
         return False
 
 
-def evaluate_all_applicants(
+def evaluate_applicant_group(
+    llm_evaluator: LLMEvaluator,
+    applicants: List[Dict[str, Any]]
+) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Evaluate several applicants with a single packed LLM call.
+
+    Args:
+        llm_evaluator: LLMEvaluator instance
+        applicants: Applicant records carrying the Compressed JSON field
+
+    Returns:
+        (``{'id': ..., 'fields': ...}`` updates to write, failure count)
+    """
+    items = []
+    failure_count = 0
+
+    for applicant in applicants:
+        compressed_json = applicant.get('fields', {}).get('Compressed JSON')
+        if not compressed_json:
+            logger.warning(f"No Compressed JSON for applicant {applicant['id']}")
+            failure_count += 1
+            continue
+        items.append((applicant['id'], compressed_json))
+
+    if not items:
+        return [], failure_count
+
+    logger.info(f"Evaluating {len(items)} applicants in one {llm_evaluator.provider} call")
+
+    # The completion has to hold one answer block per applicant, but may not
+    # exceed what the model can return (that would be a non-retryable 400).
+    # Only cache answers that cover every applicant in the group.
+    applicant_ids = {applicant_id for applicant_id, _ in items}
+    response = llm_evaluator.call_llm(
+        build_batched_evaluation_prompt(items),
+        max_tokens=min(llm_evaluator.max_tokens * len(items), Config.MAX_COMPLETION_TOKENS),
+        system=BATCHED_EVALUATION_INSTRUCTIONS,
+        is_valid=lambda text: parse_batched_llm_response(text).keys() >= applicant_ids
+    )
+
+    if not response:
+        logger.error(f"Failed to get LLM response for applicants {sorted(applicant_ids)}")
+        return [], failure_count + len(items)
+
+    results = parse_batched_llm_response(response)
+    updates = []
+
+    for applicant_id, _ in items:
+        parsed = results.get(applicant_id)
+        if not parsed:
+            logger.error(f"No evaluation returned for applicant {applicant_id}")
+            failure_count += 1
+            continue
+        updates.append({'id': applicant_id, 'fields': _evaluation_fields(parsed)})
+
+    return updates, failure_count
+
+
+def _evaluate_with_batch_api(
+    client: AirtableClient,
+    llm_evaluator: LLMEvaluator,
+    applicants: List[Dict[str, Any]]
+) -> Tuple[int, int]:
+    """
+    Evaluate applicants through a single Batch API job and write the results.
+
+    Answers already in the response cache are reused rather than resubmitted,
+    and every batch answer that parses is cached, so an interrupted run can be
+    resumed without paying for the same completions twice.
+
+    Args:
+        client: AirtableClient instance
+        llm_evaluator: LLMEvaluator instance
+        applicants: Applicant records to evaluate
+
+    Returns:
+        (success count, failure count)
+    """
+    prompts = {}
+    updates = []
+    success_count = 0
+    failure_count = 0
+
+    for applicant in applicants:
+        compressed_json = applicant.get('fields', {}).get('Compressed JSON')
+        if not compressed_json:
+            logger.warning(f"No Compressed JSON for applicant {applicant['id']}")
+            failure_count += 1
+            continue
+
+        prompt = build_evaluation_prompt(compressed_json)
+        cached = None
+        if llm_evaluator.cache is not None:
+            cached = llm_evaluator.cache.get(llm_evaluator.cache_key(prompt))
+        parsed = parse_llm_response(cached) if cached else None
+        if parsed is not None:
+            updates.append({'id': applicant['id'], 'fields': _evaluation_fields(parsed)})
+        else:
+            prompts[applicant['id']] = prompt
+
+    if prompts:
+        batch_id = llm_evaluator.submit_batch(prompts)
+        if not batch_id:
+            failure_count += len(prompts)
+            prompts = {}
+
+    answered = set()
+    results = llm_evaluator.poll_batch(batch_id) if prompts else iter(())
+
+    for applicant_id, response in results:
+        answered.add(applicant_id)
+        parsed = parse_llm_response(response) if response else None
+        if parsed is None:
+            logger.error(f"No usable evaluation returned for applicant {applicant_id}")
+            failure_count += 1
+            continue
+
+        if llm_evaluator.cache is not None:
+            llm_evaluator.cache.put(llm_evaluator.cache_key(prompts[applicant_id]), response)
+        updates.append({'id': applicant_id, 'fields': _evaluation_fields(parsed)})
+
+        # Write as results arrive rather than holding them all until the end
+        if len(updates) >= MAX_BATCH_RECORDS:
+            written, failed = _write_evaluations(client, updates)
+            success_count += written
+            failure_count += failed
+            updates = []
+
+    written, failed = _write_evaluations(client, updates)
+    success_count += written
+    failure_count += failed
+
+    # Requests missing from the output (e.g. the batch failed or expired)
+    failure_count += len(prompts.keys() - answered)
+
+    return success_count, failure_count
+
+
+def _write_evaluations(client: AirtableClient, updates: List[Dict[str, Any]]) -> Tuple[int, int]:
+    """
+    Write evaluation results back to Airtable in batches of up to 10 records.
+
+    Args:
+        client: AirtableClient instance
+        updates: ``{'id': ..., 'fields': ...}`` dictionaries
+
+    Returns:
+        (success count, failure count)
+    """
+    success_count = 0
+    failure_count = 0
+
+    for i in range(0, len(updates), MAX_BATCH_RECORDS):
+        chunk = updates[i:i + MAX_BATCH_RECORDS]
+        if client.batch_update_applicants(chunk) is not None:
+            success_count += len(chunk)
+        else:
+            failure_count += len(chunk)
+
+    return success_count, failure_count
+
+
+def evaluate_records(
     client: AirtableClient,
     llm_evaluator: LLMEvaluator,
+    records: List[Dict[str, Any]],
     force: bool = False
 ) -> None:
     """
-    Evaluate all applicants with LLM.
+    Evaluate the given applicant records with LLM.
 
     Args:
         client: AirtableClient instance
         llm_evaluator: LLMEvaluator instance
+        records: Applicant records carrying the Compressed JSON field
         force: Force re-evaluation of already evaluated applicants
     """
-    logger.info("Starting LLM evaluation for all applicants")
-
-    applicants = client.get_all_applicants()
-    logger.info(f"Found {len(applicants)} applicants to process")
+    pending = records
+    if not force:
+        pending = [record for record in records if not record.get('fields', {}).get('LLM Summary')]
 
     success_count = 0
-    skipped_count = 0
     failure_count = 0
 
-    for applicant in applicants:
-        applicant_id = applicant['id']
-        fields = applicant.get('fields', {})
+    # Results are written from this thread in batches of 10 rather than one
+    # update request per applicant
+    pending_updates = []
+
+    if Config.USE_BATCH_API and llm_evaluator.provider == 'openai':
+        success_count, failure_count = _evaluate_with_batch_api(client, llm_evaluator, pending)
+    elif Config.LLM_BATCH_SIZE > 1:
+        # Pack several applicants into each prompt so the instructions are sent
+        # once per group and the request count drops by the group size. Groups
+        # shrink so each applicant still gets its full per-call token budget.
+        group_size = max(
+            1, min(Config.LLM_BATCH_SIZE, Config.MAX_COMPLETION_TOKENS // llm_evaluator.max_tokens)
+        )
+        groups = [
+            pending[i:i + group_size]
+            for i in range(0, len(pending), group_size)
+        ]
+        with ThreadPoolExecutor(max_workers=Config.LLM_CONCURRENCY) as executor:
+            futures = [
+                executor.submit(evaluate_applicant_group, llm_evaluator, group)
+                for group in groups
+            ]
+            for future in as_completed(futures):
+                group_updates, group_failure = future.result()
+                pending_updates.extend(group_updates)
+                failure_count += group_failure
+
+                # Write as groups complete so an interrupted run keeps what it paid for
+                if len(pending_updates) >= MAX_BATCH_RECORDS:
+                    written, failed = _write_evaluations(client, pending_updates)
+                    success_count += written
+                    failure_count += failed
+                    pending_updates = []
+    else:
+        # LLM calls are dominated by API latency, so keep several in flight at once;
+        # the pool size bounds concurrency to stay within provider rate limits.
+        # The records from the listing are evaluated directly, with no re-fetch.
+        with ThreadPoolExecutor(max_workers=Config.LLM_CONCURRENCY) as executor:
+            futures = {
+                executor.submit(_evaluate_record, llm_evaluator, applicant): applicant['id']
+                for applicant in pending
+            }
+            for future in as_completed(futures):
+                update_fields = future.result()
+                if update_fields is None:
+                    failure_count += 1
+                    continue
+
+                pending_updates.append({'id': futures[future], 'fields': update_fields})
+
+                if len(pending_updates) == MAX_BATCH_RECORDS:
+                    written, failed = _write_evaluations(client, pending_updates)
+                    success_count += written
+                    failure_count += failed
+                    pending_updates = []
+
+    written, failed = _write_evaluations(client, pending_updates)
+    success_count += written
+    failure_count += failed
+
+    logger.info(f"Evaluation complete: {success_count} successful, {failure_count} failed")
+
+    if llm_evaluator.cache is not None:
+        cache = llm_evaluator.cache
+        logger.info(f"LLM cache: {cache.hits} hits, {cache.misses} misses")
 
-        # Skip if already evaluated (unless forced)
-        if not force and fields.get('LLM Summary'):
-            logger.info(f"Skipping already evaluated applicant {applicant_id}")
-            skipped_count += 1
-            continue
 
-        if evaluate_applicant_with_llm(client, llm_evaluator, applicant_id, force):
-            success_count += 1
-        else:
-            failure_count += 1
+def evaluate_all_applicants(
+    client: AirtableClient,
+    llm_evaluator: LLMEvaluator,
+    force: bool = False
+) -> None:
+    """
+    Evaluate all applicants with LLM.
 
-        # Small delay to avoid rate limiting
-        time.sleep(1)
+    Args:
+        client: AirtableClient instance
+        llm_evaluator: LLMEvaluator instance
+        force: Force re-evaluation of already evaluated applicants
+    """
+    logger.info("Starting LLM evaluation for all applicants")
+
+    # Unless forced, let Airtable return only applicants that still need an evaluation
+    if force:
+        applicants = client.get_all_applicants()
+    else:
+        applicants = client.get_unevaluated_applicants()
+    logger.info(f"Found {len(applicants)} applicants to evaluate")
 
-    logger.info(f"Evaluation complete: {success_count} successful, {skipped_count} skipped, {failure_count} failed")
+    evaluate_records(client, llm_evaluator, applicants, force)
 
 
 def main():
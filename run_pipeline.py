@@ -9,9 +9,9 @@ Orchestrates the complete workflow:
 import logging
 import argparse
 from airtable_utils import AirtableClient
-from compress_json import update_compressed_json, compress_all_applicants
-from shortlist_leads import process_applicant as shortlist_applicant, process_all_applicants as shortlist_all
-from llm_evaluation import LLMEvaluator, evaluate_applicant_with_llm, evaluate_all_applicants
+from compress_json import compress_applicant_data, update_compressed_json, compress_records
+from shortlist_leads import process_applicant as shortlist_applicant, shortlist_records
+from llm_evaluation import LLMEvaluator, evaluate_applicant_with_llm, evaluate_records
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
@@ -37,19 +37,32 @@ def run_pipeline_for_applicant(applicant_id: str, force_llm: bool = False) -> bo
 
         # Step 1: Compress data to JSON
         logger.info("Step 1: Compressing data to JSON...")
-        if not update_compressed_json(client, applicant_id):
+        compressed_data = compress_applicant_data(client, applicant_id)
+        if not update_compressed_json(client, applicant_id, compressed_data):
             logger.error("Failed to compress data")
             return False
 
+        # Fetch the refreshed record once and hand it, with the data just
+        # compressed, to the later steps instead of re-fetching and re-parsing
+        applicant = client.get_applicant(applicant_id)
+        if not applicant:
+            logger.error(f"Applicant {applicant_id} not found")
+            return False
+
         # Step 2: Evaluate for shortlisting
         logger.info("Step 2: Evaluating for shortlisting...")
-        if not shortlist_applicant(client, applicant_id):
+        if not shortlist_applicant(
+            client, applicant_id, applicant_record=applicant, parsed_data=compressed_data
+        ):
             logger.error("Failed to shortlist evaluation")
             return False
 
         # Step 3: LLM evaluation
         logger.info("Step 3: Running LLM evaluation...")
-        if not evaluate_applicant_with_llm(client, llm_evaluator, applicant_id, force_llm):
+        if not evaluate_applicant_with_llm(
+            client, llm_evaluator, applicant_id, force_llm,
+            prefetched=applicant, parsed_data=compressed_data
+        ):
             logger.error("Failed LLM evaluation")
             return False
 
@@ -75,17 +88,22 @@ def run_pipeline_for_all(force_llm: bool = False) -> None:
         client = AirtableClient()
         llm_evaluator = LLMEvaluator()
 
+        # List the applicants once; every stage works on these records, and
+        # compression refreshes their Compressed JSON in place for the later stages
+        records = client.get_all_applicants()
+        logger.info(f"Found {len(records)} applicants")
+
         # Step 1: Compress all applicants
         logger.info("Step 1: Compressing data for all applicants...")
-        compress_all_applicants(client)
+        compress_records(client, records)
 
         # Step 2: Shortlist evaluation for all
         logger.info("Step 2: Evaluating all applicants for shortlisting...")
-        shortlist_all(client)
+        shortlist_records(client, records)
 
         # Step 3: LLM evaluation for all
         logger.info("Step 3: Running LLM evaluation for all applicants...")
-        evaluate_all_applicants(client, llm_evaluator, force_llm)
+        evaluate_records(client, llm_evaluator, records, force_llm)
 
         logger.info("Pipeline completed successfully for all applicants")
 
@@ -11,15 +11,40 @@ Criteria:
 
 import json
 import logging
-from typing import Dict, Any, Optional, List
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Dict, Any, Iterable, Optional, List
 from datetime import datetime
-from airtable_utils import AirtableClient
+from airtable_utils import AirtableClient, MAX_BATCH_RECORDS
 from config import Config
+import json_utils
 
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 logger = logging.getLogger(__name__)
 
 
+def _compile_alternation(terms: Iterable[str]) -> Optional[re.Pattern]:
+    """
+    Compile normalized terms into one alternation that matches any of them.
+
+    Args:
+        terms: Lowercased terms to search for
+
+    Returns:
+        Compiled pattern, or None when there are no terms (nothing should match)
+    """
+    if not terms:
+        return None
+    # Longest first so overlapping names report the most specific match
+    return re.compile('|'.join(re.escape(term) for term in sorted(terms, key=len, reverse=True)))
+
+
+# Normalized criteria, computed once at import instead of per applicant.
+# Each alternation finds any configured name in a single scan of the input string.
+_TIER1_RE = _compile_alternation(Config.tier1_companies())
+_APPROVED_RE = _compile_alternation(Config.approved_locations())
+
+
 def normalize_location(location: str) -> str:
     """Normalize location string for comparison."""
     if not location:
@@ -37,17 +62,11 @@ def check_location_criteria(location: str) -> bool:
     Returns:
         True if location is approved, False otherwise
     """
-    if not location:
+    if not location or _APPROVED_RE is None:
         return False
 
-    normalized_location = normalize_location(location)
-
     # Check against approved locations
-    for approved in Config.APPROVED_LOCATIONS:
-        if normalize_location(approved) in normalized_location:
-            return True
-
-    return False
+    return _APPROVED_RE.search(normalize_location(location)) is not None
 
 
 def check_experience_criteria(compressed_data: Dict[str, Any]) -> tuple[bool, str]:
@@ -69,12 +88,11 @@ def check_experience_criteria(compressed_data: Dict[str, Any]) -> tuple[bool, st
     experiences = compressed_data.get('experience', [])
     tier1_companies = []
 
-    for exp in experiences:
-        company = exp.get('company', '').strip()
-        for tier1 in Config.TIER_1_COMPANIES:
-            if tier1.strip().lower() in company.lower():
+    if _TIER1_RE is not None:
+        for exp in experiences:
+            company = exp.get('company', '').strip()
+            if _TIER1_RE.search(company.lower()):
                 tier1_companies.append(company)
-                break
 
     if tier1_companies:
         return True, f"Worked at Tier-1 company: {', '.join(set(tier1_companies))}"
@@ -118,13 +136,20 @@ def check_compensation_criteria(compressed_data: Dict[str, Any]) -> tuple[bool,
     return True, f"Rate ${preferred_rate}/hr <= ${Config.MAX_HOURLY_RATE}/hr and {availability} hrs/wk >= {Config.MIN_AVAILABILITY_HOURS} hrs/wk"
 
 
-def evaluate_applicant(client: AirtableClient, applicant_id: str) -> Optional[Dict[str, Any]]:
+def evaluate_applicant(
+    client: AirtableClient,
+    applicant_id: str,
+    applicant_record: Optional[Dict[str, Any]] = None,
+    parsed_data: Optional[Dict[str, Any]] = None
+) -> Optional[Dict[str, Any]]:
     """
     Evaluate an applicant against shortlist criteria.
 
     Args:
         client: AirtableClient instance
         applicant_id: The Airtable record ID of the applicant
+        applicant_record: Applicant record already fetched by the caller (skips the lookup)
+        parsed_data: Already parsed Compressed JSON (skips re-parsing it)
 
     Returns:
         Dictionary with evaluation results or None on error
@@ -133,7 +158,7 @@ def evaluate_applicant(client: AirtableClient, applicant_id: str) -> Optional[Di
 
     try:
         # Get applicant record
-        applicant = client.get_applicant(applicant_id)
+        applicant = applicant_record or client.get_applicant(applicant_id)
         if not applicant:
             logger.error(f"Applicant {applicant_id} not found")
             return None
@@ -145,11 +170,13 @@ def evaluate_applicant(client: AirtableClient, applicant_id: str) -> Optional[Di
             return None
 
         # Parse JSON
-        try:
-            data = json.loads(compressed_json)
-        except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON for applicant {applicant_id}: {e}")
-            return None
+        data = parsed_data
+        if data is None:
+            try:
+                data = json_utils.loads(compressed_json)
+            except json.JSONDecodeError as e:
+                logger.error(f"Invalid JSON for applicant {applicant_id}: {e}")
+                return None
 
         # Evaluate each criterion
         criteria_results = {}
@@ -208,8 +235,12 @@ def create_shortlisted_lead(client: AirtableClient, evaluation: Dict[str, Any])
 
     applicant_id = evaluation['applicant_id']
 
-    # Check if already shortlisted
-    if client.check_shortlisted_lead_exists(applicant_id):
+    # Check if already shortlisted; if the check itself failed, creating a lead
+    # could duplicate one that exists, so give up on this applicant
+    exists = client.check_shortlisted_lead_exists(applicant_id)
+    if exists is None:
+        return False
+    if exists:
         logger.info(f"Applicant {applicant_id} already shortlisted")
         return True
 
@@ -240,18 +271,25 @@ def create_shortlisted_lead(client: AirtableClient, evaluation: Dict[str, Any])
         return False
 
 
-def process_applicant(client: AirtableClient, applicant_id: str) -> bool:
+def process_applicant(
+    client: AirtableClient,
+    applicant_id: str,
+    applicant_record: Optional[Dict[str, Any]] = None,
+    parsed_data: Optional[Dict[str, Any]] = None
+) -> bool:
     """
     Evaluate and potentially shortlist an applicant.
 
     Args:
         client: AirtableClient instance
         applicant_id: The Airtable record ID of the applicant
+        applicant_record: Applicant record already fetched by the caller (skips the lookup)
+        parsed_data: Already parsed Compressed JSON (skips re-parsing it)
 
     Returns:
         True if processed successfully, False otherwise
     """
-    evaluation = evaluate_applicant(client, applicant_id)
+    evaluation = evaluate_applicant(client, applicant_id, applicant_record, parsed_data)
 
     if not evaluation:
         return False
@@ -265,32 +303,90 @@ def process_applicant(client: AirtableClient, applicant_id: str) -> bool:
         return True
 
 
-def process_all_applicants(client: AirtableClient) -> None:
+def shortlist_records(
+    client: AirtableClient,
+    records: List[Dict[str, Any]],
+    force: bool = False
+) -> None:
     """
-    Process all applicants for shortlisting.
+    Process the given applicant records for shortlisting.
 
     Args:
         client: AirtableClient instance
+        records: Applicant records carrying the Compressed JSON field
+        force: Re-process applicants that already have a Shortlist Status
     """
-    logger.info("Processing all applicants for shortlisting")
-
-    applicants = client.get_all_applicants()
-    logger.info(f"Found {len(applicants)} applicants to process")
+    if not force:
+        records = [
+            record for record in records
+            if not record.get('fields', {}).get('Shortlist Status')
+        ]
 
     shortlisted_count = 0
     processed_count = 0
 
-    for applicant in applicants:
-        applicant_id = applicant['id']
-        if process_applicant(client, applicant_id):
-            processed_count += 1
-            # Check if shortlisted
-            if client.check_shortlisted_lead_exists(applicant_id):
+    # Check the criteria for every record up front; the records already carry
+    # the Compressed JSON, so this pass is pure CPU work with no round-trips
+    passed = []
+    rejected_updates = []
+    for applicant in records:
+        evaluation = evaluate_applicant(client, applicant['id'], applicant)
+        if not evaluation:
+            continue
+
+        if evaluation['shortlisted']:
+            passed.append(evaluation)
+            continue
+
+        processed_count += 1
+        logger.info(f"Applicant {applicant['id']} not shortlisted")
+        # Leave records that already carry the same status untouched
+        if applicant.get('fields', {}).get('Shortlist Status') != 'Not Shortlisted':
+            rejected_updates.append(
+                {'id': applicant['id'], 'fields': {'Shortlist Status': 'Not Shortlisted'}}
+            )
+
+    # Write the rejections back in batches of up to 10 records per request
+    for start in range(0, len(rejected_updates), MAX_BATCH_RECORDS):
+        chunk = rejected_updates[start:start + MAX_BATCH_RECORDS]
+        if client.batch_update_applicants(chunk) is None:
+            processed_count -= len(chunk)
+
+    # Only applicants that passed need lead creation, which is a few Airtable
+    # round-trips each, so run several at once over the shared connection pool
+    with ThreadPoolExecutor(max_workers=Config.SHORTLIST_CONCURRENCY) as executor:
+        futures = [
+            executor.submit(create_shortlisted_lead, client, evaluation)
+            for evaluation in passed
+        ]
+        for future in as_completed(futures):
+            if future.result():
+                processed_count += 1
                 shortlisted_count += 1
 
     logger.info(f"Processing complete: {processed_count} processed, {shortlisted_count} shortlisted")
 
 
+def process_all_applicants(client: AirtableClient, force: bool = False) -> None:
+    """
+    Process all applicants for shortlisting.
+
+    Args:
+        client: AirtableClient instance
+        force: Re-process applicants that already have a Shortlist Status
+    """
+    logger.info("Processing all applicants for shortlisting")
+
+    # Unless forced, let Airtable return only applicants without a shortlist decision
+    if force:
+        applicants = client.get_all_applicants()
+    else:
+        applicants = client.get_unshortlisted_applicants()
+    logger.info(f"Found {len(applicants)} applicants to process")
+
+    shortlist_records(client, applicants, force)
+
+
 def main():
     """Main entry point for the shortlist automation script."""
     import argparse
@@ -308,6 +404,11 @@ def main():
         action='store_true',
         help='Process all applicants'
     )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Re-process applicants that already have a Shortlist Status'
+    )
 
     args = parser.parse_args()
 
@@ -323,7 +424,7 @@ def main():
             print(f"Failed to process applicant {args.applicant_id}")
     elif args.all:
         # Process all applicants
-        process_all_applicants(client)
+        process_all_applicants(client, args.force)
     else:
         print("Please specify either --applicant-id or --all")
         parser.print_help()